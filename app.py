@@ -90,7 +90,8 @@ with st.sidebar:
         
         st.markdown("### 🏆 Best Model")
         # Determine best model
-        best_model = min(results.items(), key=lambda x: x[1]['val_rmse'])
+        selected = [item for item in results.items() if item[1].get('selected')]
+        best_model = selected[0] if selected else min(results.items(), key=lambda x: x[1]['val_rmse'])
         st.success(f"**{best_model[0]}**")
         
         st.markdown("### 📈 Performance Metrics")
@@ -268,7 +269,7 @@ with tab1:
             try:
                 # Make prediction
                 predictor = HousePricePredictor()
-                result = predictor.predict_with_confidence(input_data)
+                result = predictor.predict_with_confidence(input_data, return_features=True)
                 
                 # Display prediction
                 st.markdown(f"""
@@ -279,6 +280,16 @@ with tab1:
                     </div>
                 """, unsafe_allow_html=True)
                 
+                # Top drivers of this prediction
+                explanation = predictor.explain(input_data, X=result.get('features'))
+                if explanation is not None:
+                    st.markdown("### 🔍 What Drives This Price")
+                    driver_cols = st.columns(len(explanation['contributions']))
+                    for driver_col, (feature, contribution) in zip(driver_cols, explanation['contributions'].items()):
+                        with driver_col:
+                            st.metric(feature, f"{'+' if contribution >= 0 else '-'}${abs(contribution):,.0f}")
+                    st.caption(f"Contributions relative to an average house (${explanation['baseline']:,.0f})")
+                
                 # Additional insights
                 col_a, col_b, col_c = st.columns(3)
                 
@@ -316,6 +327,14 @@ with tab2:
                 'Validation R²': f"{metrics['val_r2']:.4f}",
                 'Training Time': f"{metrics['training_time']:.2f}s"
             })
+            if 'p99_latency_ms' in metrics:
+                comparison_data[-1].update({
+                    'P99 Latency': f"{metrics['p99_latency_ms']:.2f}ms",
+                    'Throughput': f"{metrics['throughput_rps']:,.0f} rows/s",
+                    'Size': f"{metrics['size_mb']:.1f}MB",
+                    'Memory': f"{metrics['memory_mb']:.1f}MB",
+                    'Selected': '🏆' if metrics.get('selected') else ''
+                })
         
         df_comparison = pd.DataFrame(comparison_data)
         
@@ -414,8 +433,9 @@ with tab3:
     **Dataset**: Kaggle - House Prices: Advanced Regression Techniques
     
     **Algorithms Used**:
-    1. **Ridge Regression**: Linear regression with L2 regularization
+    1. **Ridge Regression**: Linear regression with L2 regularization (label-encoded or sparse one-hot categoricals)
     2. **Random Forest**: Ensemble of decision trees
+    3. **Gradient Boosting**: Histogram-based boosted trees with native categorical splits
     
     **Evaluation Metrics**:
     - RMSE (Root Mean Squared Error)
@@ -0,0 +1,153 @@
+"""
+Backtesting Module
+Replays the sales history in YrSold/MoSold order: each window fits the
+preprocessor and model on past periods only and scores the periods that
+follow, giving a per-period error table for choosing a retraining frequency
+"""
+
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+import joblib
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import Ridge
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error, mean_absolute_error
+from data_preprocessing import HousePricePreprocessor
+
+
+def add_periods(df, period_months=3):
+    """Period number (0 = first period in the data) and its label, from YrSold and MoSold"""
+    first_year = df['YrSold'].min()
+    months = (df['YrSold'] - first_year) * 12 + df['MoSold'] - 1
+    df = df.copy()
+    df['period'] = months // period_months
+    start = df['period'] * period_months
+    df['period_label'] = (first_year + start // 12).astype(str) + '-' + (start % 12 + 1).map('{:02d}'.format)
+    return df
+
+
+def make_windows(n_periods, scheme='expanding', train_periods=8):
+    """(first training period, first test period) pairs; rolling windows keep train_periods periods"""
+    return [
+        (0 if scheme == 'expanding' else end - train_periods, end)
+        for end in range(train_periods, n_periods)
+    ]
+
+
+def prepare_window(train_df, future_df, window_key):
+    """Fit a fresh preprocessor on the training rows and transform both sets"""
+    period_columns = ['period', 'period_label']
+    preprocessor = HousePricePreprocessor()
+    # The window itself is cached, so its throwaway profile is kept in memory only
+    X_train, y_train = preprocessor.fit_features(train_df.drop(columns=period_columns), profile_cache_dir=None)
+    preprocessor.test_df = future_df.drop(columns=period_columns + ['SalePrice'])
+    X_future = preprocessor.preprocess_test_data()
+    return X_train.values, y_train.values, X_future.values
+
+
+def score_window(prepare, train_df, future_df, window_key, name, model):
+    """Fit model on one window and score each following period separately"""
+    X_train, y_train, X_future = prepare(train_df, future_df, window_key)
+    fitted = clone(model).fit(X_train, y_train)
+    predictions = fitted.predict(X_future)
+
+    rows = []
+    last_train_period = train_df['period'].max()
+    for period, group in future_df.groupby('period'):
+        mask = (future_df['period'] == period).values
+        y_true = group['SalePrice'].values
+        rows.append({
+            'model': name,
+            'train_start': train_df.loc[train_df['period'].idxmin(), 'period_label'],
+            'train_end': train_df.loc[train_df['period'].idxmax(), 'period_label'],
+            'test_period': group['period_label'].iloc[0],
+            'periods_ahead': int(period - last_train_period),
+            'n_train': len(train_df),
+            'n_test': len(group),
+            'rmse': np.sqrt(mean_squared_error(y_true, predictions[mask])),
+            'mae': mean_absolute_error(y_true, predictions[mask]),
+            'mape': np.mean(np.abs(predictions[mask] - y_true) / y_true) * 100
+        })
+    return rows
+
+
+def default_models(artifacts_dir='models'):
+    """Unfitted copies of the tuned Ridge and Random Forest, or untuned defaults if none are saved"""
+    models = {}
+    for name, fallback in [('Ridge Regression', Ridge(alpha=10, random_state=42)),
+                           ('Random Forest', RandomForestRegressor(n_estimators=200, random_state=42))]:
+        path = os.path.join(artifacts_dir, f"{name.lower().replace(' ', '_')}.pkl")
+        models[name] = clone(joblib.load(path)) if os.path.exists(path) else fallback
+    # Windows already run in parallel processes
+    for model in models.values():
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=1)
+    return models
+
+
+class Backtester:
+    """Time-ordered backtests of several models over rolling or expanding windows"""
+
+    def __init__(self, models=None, scheme='expanding', period_months=3, train_periods=8, horizon=1,
+                 min_test_rows=20, n_jobs=-1, cache_dir='models/backtest_cache'):
+        self.models = models if models is not None else default_models()
+        self.scheme = scheme
+        self.period_months = period_months
+        self.train_periods = train_periods
+        self.horizon = horizon
+        self.min_test_rows = min_test_rows
+        self.n_jobs = n_jobs
+        # Preprocessed windows are cached on disk and shared by every model and rerun
+        self.memory = Memory(cache_dir, verbose=0)
+        self.results = None
+
+    def run(self, data_path='train.csv'):
+        """Backtest every model on every window and return the per-period error table"""
+        print(f"\n=== BACKTESTING ({self.scheme} windows, {self.period_months}-month periods) ===")
+        df = add_periods(pd.read_csv(data_path), self.period_months)
+        windows = make_windows(df['period'].max() + 1, self.scheme, self.train_periods)
+        # Windows are identified by the data hash and their period bounds, which is much
+        # cheaper than hashing each window's rows
+        data_hash = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values).hexdigest()[:16]
+        splits = [
+            (df[(df['period'] >= start) & (df['period'] < end)],
+             df[(df['period'] >= end) & (df['period'] < end + self.horizon)],
+             (data_hash, self.period_months, start, end, self.horizon))
+            for start, end in windows
+        ]
+        print(f"{len(splits)} windows x {len(self.models)} models, horizon {self.horizon} periods")
+
+        # Preprocess each window once; every model fit below reads it back from the cache
+        prepare = self.memory.cache(prepare_window, ignore=['train_df', 'future_df'])
+        Parallel(n_jobs=self.n_jobs)(delayed(prepare)(*split) for split in splits)
+
+        rows = Parallel(n_jobs=self.n_jobs)(
+            delayed(score_window)(prepare, *split, name, model)
+            for split in splits
+            for name, model in self.models.items()
+        )
+        results = pd.DataFrame([row for window in rows for row in window])
+        self.results = results[results['n_test'] >= self.min_test_rows].reset_index(drop=True)
+        return self.results
+
+    def summary(self):
+        """Mean RMSE per model by how many periods after training the sales happened"""
+        return self.results.pivot_table(index='model', columns='periods_ahead', values='rmse', aggfunc='mean')
+
+
+if __name__ == "__main__":
+    # Example usage: quarterly expanding windows, scoring up to four quarters after each fit
+    backtester = Backtester(horizon=4)
+    results = backtester.run('train.csv')
+
+    print("\nRMSE by test period (one period ahead):")
+    print(results[results['periods_ahead'] == 1]
+          .pivot_table(index='test_period', columns='model', values='rmse').round(0).to_string())
+    print("\nMean RMSE by periods since training:")
+    print(backtester.summary().round(0).to_string())
+
+    results.to_csv('models/backtest_results.csv', index=False)
+    print("\n✅ Backtest results saved to 'models/backtest_results.csv'")
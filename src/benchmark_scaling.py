@@ -0,0 +1,177 @@
+"""
+Training Scalability Benchmark
+Runs load_data -> preprocess -> each trainer on synthetic datasets of growing
+size and records wall time and peak memory for every stage; each stage runs
+in its own process so its peak resident memory, joblib workers included, can
+be read from the operating system
+"""
+
+import os
+import sys
+import time
+import resource
+import multiprocessing
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from data_preprocessing import HousePricePreprocessor
+from train_models import ModelTrainer
+from synthetic_data import SyntheticDataGenerator
+from joblib.externals.loky import get_reusable_executor
+from joblib.externals.loky.process_executor import TerminatedWorkerError, BrokenProcessPool
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_TRAINERS = ['train_ridge_regression', 'train_random_forest']
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    """Peak resident memory of this process, or of its largest finished child process"""
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return resource.getrusage(who).ru_maxrss / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def reset_peak_rss():
+    """Restart this process's peak RSS from its current RSS, where the OS allows it (Linux)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def measure(func, *args):
+    """Run func and return (result, seconds, peak MB, worker peak MB, status); running out of memory is reported, not raised
+
+    The peak is this process's peak RSS plus that of its largest joblib worker, so call it in
+    a fresh process (see measure_stage). Workers killed mid-task count as out of memory.
+    """
+    reset_peak_rss()
+    start_time = time.time()
+    try:
+        result = func(*args)
+        status = 'ok'
+    except (MemoryError, TerminatedWorkerError, BrokenProcessPool):
+        result = None
+        status = 'oom'
+    elapsed = time.time() - start_time
+    # Workers only count towards RUSAGE_CHILDREN once they have exited and been waited for
+    get_reusable_executor().shutdown(wait=True)
+    worker_peak_mb = peak_rss_mb(resource.RUSAGE_CHILDREN)
+    return result, elapsed, peak_rss_mb() + worker_peak_mb, worker_peak_mb, status
+
+
+def run_stage(connection, stage, train_path, test_path):
+    """Child process: run the stages before stage unmeasured, then measure stage"""
+    preprocessor = HousePricePreprocessor()
+    if stage == 'load_data':
+        func, args = preprocessor.load_data, (train_path, test_path)
+    else:
+        preprocessor.load_data(train_path, test_path)
+        if stage == 'preprocess':
+            func, args = preprocessor.preprocess, (False,)
+        else:
+            X_train, X_val, y_train, y_val = preprocessor.preprocess(False)
+            func, args = getattr(ModelTrainer(), stage), (X_train, y_train, X_val, y_val)
+    connection.send(measure(func, *args)[1:])
+
+
+def measure_stage(stage, train_path, test_path):
+    """Run one stage in a fresh process and return (seconds, peak MB, worker peak MB, status)"""
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=run_stage, args=(sender, stage, train_path, test_path))
+    process.start()
+    process.join()
+    if receiver.poll():
+        return receiver.recv()
+    # Killed by a signal, usually the kernel's OOM killer
+    status = 'oom' if process.exitcode < 0 else 'error'
+    return np.nan, np.nan, np.nan, status
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, trainers=DEFAULT_TRAINERS,
+                  data_dir='data/synthetic', test_path='test.csv'):
+    """Benchmark every stage at every size and return one row per (size, stage)"""
+    generator = SyntheticDataGenerator()
+    records = []
+    failed = set()
+
+    for n_rows in sizes:
+        print("\n" + "=" * 60)
+        print(f"BENCHMARK: {n_rows:,} rows")
+        print("=" * 60)
+
+        train_path = os.path.join(data_dir, f'train_{n_rows}.csv')
+        if not os.path.exists(train_path):
+            generator.write(n_rows, train_path)
+
+        for stage in ['load_data', 'preprocess'] + list(trainers):
+            # Once a stage runs out of memory, larger sizes are skipped for it and the stages after it
+            if stage in failed:
+                records.append({'rows': n_rows, 'stage': stage, 'seconds': np.nan, 'peak_mb': np.nan,
+                                'worker_peak_mb': np.nan, 'status': 'skipped'})
+                continue
+
+            elapsed, peak_mb, worker_peak_mb, status = measure_stage(stage, train_path, test_path)
+            if status != 'ok':
+                failed.add(stage)
+                if stage in ('load_data', 'preprocess'):
+                    failed.update(['preprocess'] + list(trainers))
+
+            records.append({'rows': n_rows, 'stage': stage, 'seconds': elapsed, 'peak_mb': peak_mb,
+                            'worker_peak_mb': worker_peak_mb, 'status': status})
+            print(f"⏱️  {stage}: {elapsed:.2f}s, peak {peak_mb:,.1f} MB "
+                  f"({worker_peak_mb:,.1f} MB in workers) ({status})")
+
+    return add_scaling_exponents(pd.DataFrame(records))
+
+
+def add_scaling_exponents(results_df):
+    """Add the local log-log slope of time vs. rows; above ~1.1 means superlinear"""
+    results_df = results_df.sort_values(['stage', 'rows']).copy()
+    log_seconds = np.log(results_df['seconds']).groupby(results_df['stage']).diff()
+    log_rows = np.log(results_df['rows']).groupby(results_df['stage']).diff()
+    results_df['time_exponent'] = log_seconds / log_rows
+    results_df['superlinear'] = results_df['time_exponent'] > 1.1
+    return results_df.reset_index(drop=True)
+
+
+def plot_scaling(results_df, output_path='models/scaling_benchmark.png'):
+    """Plot time and peak memory against rows on log-log axes"""
+    fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+    fig.suptitle('Training Scalability', fontsize=16, fontweight='bold')
+
+    for stage, group in results_df.groupby('stage'):
+        axes[0].plot(group['rows'], group['seconds'], marker='o', label=stage)
+        axes[1].plot(group['rows'], group['peak_mb'], marker='o', label=stage)
+
+    axes[0].set_title('Wall Time')
+    axes[0].set_ylabel('Time (seconds)')
+    axes[1].set_title('Peak Memory')
+    axes[1].set_ylabel('Peak memory (MB)')
+    for ax in axes:
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('Rows')
+        ax.legend()
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    print(f"\n📊 Scaling plot saved to '{output_path}'")
+
+
+def main():
+    """Run the full scalability benchmark"""
+    results_df = run_benchmark()
+
+    print("\n=== SCALING RESULTS ===")
+    print(results_df.to_string(index=False))
+
+    results_df.to_csv('models/scaling_benchmark.csv', index=False)
+    plot_scaling(results_df)
+    print("\n✅ Benchmark completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
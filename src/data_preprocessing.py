@@ -7,7 +7,10 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.base import BaseEstimator, TransformerMixin
 import joblib
+import hashlib
+import os
 
 
 class HousePricePreprocessor:
@@ -17,6 +20,7 @@ class HousePricePreprocessor:
         self.scaler = StandardScaler()
         self.label_encoders = {}
         self.feature_names = None
+        self.profile = None
         
     def load_data(self, train_path='train.csv', test_path='test.csv'):
         """Load training and test data"""
@@ -27,38 +31,104 @@ class HousePricePreprocessor:
         print(f"Test data shape: {self.test_df.shape}")
         return self.train_df, self.test_df
     
+    def profile_data(self, df=None, cache_dir='models/profiles'):
+        """One-pass column profile, cached on disk by a hash of the data (cache_dir=None: in memory only)"""
+        df = self.train_df if df is None else df
+        data_hash = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values).hexdigest()[:16]
+        cache_path = os.path.join(cache_dir, f'profile_{data_hash}.pkl') if cache_dir is not None else None
+        if cache_path is not None and os.path.exists(cache_path):
+            self.profile = joblib.load(cache_path)
+            return self.profile
+        
+        columns = pd.DataFrame(index=df.columns)
+        columns['dtype'] = df.dtypes.astype(str)
+        fill_values = {}
+        
+        # Numerical block: one sort per column gives missing counts, cardinality and quantiles
+        numeric = df.select_dtypes(include=[np.number])
+        values = numeric.to_numpy(dtype=float)
+        ordered = np.sort(values, axis=0)  # NaN sorts to the end
+        count = (~np.isnan(values)).sum(axis=0)
+        distinct = (ordered[1:] != ordered[:-1]) & ~np.isnan(ordered[1:])
+        columns.loc[numeric.columns, 'count'] = count
+        columns.loc[numeric.columns, 'cardinality'] = np.where(count > 0, distinct.sum(axis=0) + 1, 0)
+        columns.loc[numeric.columns, 'mean'] = np.nansum(values, axis=0) / np.maximum(count, 1)
+        columns.loc[numeric.columns, 'std'] = np.nanstd(values, axis=0, ddof=1)
+        for q, name in [(0, 'min'), (0.25, '25%'), (0.5, '50%'), (0.75, '75%'), (1, 'max')]:
+            # Linear interpolation between order statistics, as pandas does
+            position = q * np.maximum(count - 1, 0)
+            lower = np.floor(position).astype(int)
+            upper = np.ceil(position).astype(int)
+            cols = np.arange(len(count))
+            columns.loc[numeric.columns, name] = (
+                ordered[lower, cols] + (ordered[upper, cols] - ordered[lower, cols]) * (position - lower)
+            )
+        fill_values.update(columns.loc[numeric.columns, '50%'].to_dict())
+        
+        # Categorical block: one value_counts per column gives count, cardinality and mode
+        for col in df.select_dtypes(include=['object']).columns:
+            counts = df[col].value_counts()
+            columns.loc[col, 'count'] = counts.sum()
+            columns.loc[col, 'cardinality'] = len(counts)
+            # Ties resolve to the smallest value, matching Series.mode()
+            mode = min(counts.index[counts == counts.max()]) if len(counts) > 0 else 'None'
+            columns.loc[col, 'mode'] = mode
+            fill_values[col] = mode
+        
+        columns['missing'] = len(df) - columns['count']
+        columns[['count', 'cardinality', 'missing']] = columns[['count', 'cardinality', 'missing']].astype(int)
+        self.profile = {
+            'hash': data_hash,
+            'n_rows': len(df),
+            'columns': columns,
+            'fill_values': fill_values
+        }
+        
+        if cache_path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            joblib.dump(self.profile, cache_path)
+        return self.profile
+    
     def explore_data(self):
         """Basic data exploration"""
+        profile = self.profile_data(self.train_df)
+        columns = profile['columns']
+        
         print("\n=== DATA EXPLORATION ===")
         print("\nFirst few rows:")
         print(self.train_df.head())
         
         print("\nData Info:")
-        print(self.train_df.info())
+        print(f"{profile['n_rows']} entries, {len(columns)} columns")
+        print(columns[['dtype', 'count', 'cardinality']])
         
         print("\nMissing Values:")
-        missing = self.train_df.isnull().sum()
+        missing = columns['missing']
         missing = missing[missing > 0].sort_values(ascending=False)
         print(missing)
         
         print("\nTarget Variable (SalePrice) Statistics:")
-        print(self.train_df['SalePrice'].describe())
+        print(columns.loc['SalePrice', ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']].astype(float))
         
         return missing
     
     def handle_missing_values(self, df):
         """Handle missing values in the dataset"""
+        # Fill values come from the training data profile when one is available
+        fill_values = self.profile['fill_values'] if self.profile is not None else {}
+        
         # Numerical features - fill with median
         numerical_cols = df.select_dtypes(include=[np.number]).columns
         for col in numerical_cols:
             if df[col].isnull().sum() > 0:
-                df[col].fillna(df[col].median(), inplace=True)
+                df[col].fillna(fill_values.get(col, df[col].median()), inplace=True)
         
         # Categorical features - fill with mode or 'None'
         categorical_cols = df.select_dtypes(include=['object']).columns
         for col in categorical_cols:
             if df[col].isnull().sum() > 0:
-                df[col].fillna(df[col].mode()[0] if len(df[col].mode()) > 0 else 'None', inplace=True)
+                mode = df[col].mode()[0] if len(df[col].mode()) > 0 else 'None'
+                df[col].fillna(fill_values.get(col, mode), inplace=True)
         
         return df
     
@@ -114,13 +184,16 @@ class HousePricePreprocessor:
         
         return df
     
-    def preprocess(self, save_preprocessor=True):
-        """Complete preprocessing pipeline"""
-        print("\n=== PREPROCESSING DATA ===")
+    def fit_features(self, df=None, profile_cache_dir='models/profiles'):
+        """Fit fill values, encoders and scaler on df (default: train_df) and return scaled X and y"""
+        df = self.train_df if df is None else df
+        
+        # Fill values for handle_missing_values (cached after the first run unless profile_cache_dir is None)
+        self.profile_data(df, cache_dir=profile_cache_dir)
         
         # Separate target variable
-        y = self.train_df['SalePrice'].copy()
-        X = self.train_df.drop('SalePrice', axis=1)
+        y = df['SalePrice'].copy()
+        X = df.drop('SalePrice', axis=1)
         
         # Prepare features
         X = self.prepare_features(X, is_training=True)
@@ -130,7 +203,15 @@ class HousePricePreprocessor:
         
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
-        X = pd.DataFrame(X_scaled, columns=X.columns)
+        X = pd.DataFrame(X_scaled, columns=X.columns, index=X.index)
+        
+        return X, y
+    
+    def preprocess(self, save_preprocessor=True):
+        """Complete preprocessing pipeline"""
+        print("\n=== PREPROCESSING DATA ===")
+        
+        X, y = self.fit_features()
         
         # Split data
         X_train, X_val, y_train, y_val = train_test_split(
@@ -145,6 +226,7 @@ class HousePricePreprocessor:
             joblib.dump(self.scaler, 'models/scaler.pkl')
             joblib.dump(self.label_encoders, 'models/label_encoders.pkl')
             joblib.dump(self.feature_names, 'models/feature_names.pkl')
+            joblib.dump(self.profile['fill_values'], 'models/fill_values.pkl')
             print("\nPreprocessor saved!")
         
         return X_train, X_val, y_train, y_val
@@ -167,6 +249,25 @@ class HousePricePreprocessor:
         return X_test
 
 
+class CategoryCodeRestorer(BaseEstimator, TransformerMixin):
+    """Undo scaling on label-encoded columns so models see the integer codes again"""
+
+    def __init__(self, categorical_indices, means, scales):
+        self.categorical_indices = categorical_indices
+        self.means = means
+        self.scales = scales
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        X = np.array(X, dtype=float)
+        idx = self.categorical_indices
+        # Unseen categories come back as -1, which tree models treat as missing
+        X[:, idx] = np.rint(X[:, idx] * self.scales + self.means)
+        return X
+
+
 if __name__ == "__main__":
     # Example usage
     preprocessor = HousePricePreprocessor()
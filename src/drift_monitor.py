@@ -0,0 +1,214 @@
+"""
+Drift Monitor Module
+Keeps fixed-size streaming sketches of incoming requests and compares them
+with reference sketches built from the training data
+"""
+
+import numpy as np
+import pandas as pd
+import joblib
+
+
+EPSILON = 1e-6
+
+
+class NumericSketch:
+    """Fixed-bin histogram with a missing-value counter"""
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.missing = 0
+
+    @classmethod
+    def from_values(cls, values, n_bins=20):
+        """Bin edges at the reference quantiles, with open-ended outer bins"""
+        values = pd.to_numeric(pd.Series(values), errors='coerce')
+        edges = np.unique(np.nanquantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])) \
+            if values.notna().any() else np.array([])
+        sketch = cls(edges)
+        sketch.update(values)
+        return sketch
+
+    def empty_copy(self):
+        return NumericSketch(self.edges)
+
+    def update(self, values):
+        values = pd.to_numeric(pd.Series(values), errors='coerce').values
+        missing = np.isnan(values)
+        self.missing += int(missing.sum())
+        bins = np.searchsorted(self.edges, values[~missing], side='right')
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+
+    def add(self, value):
+        """Single-value update without building a Series"""
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = np.nan
+        if np.isnan(value):
+            self.missing += 1
+        else:
+            self.counts[np.searchsorted(self.edges, value, side='right')] += 1
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.missing += other.missing
+
+    @property
+    def n(self):
+        return int(self.counts.sum()) + self.missing
+
+    def distribution(self):
+        """Bin counts with missing values as a final bin"""
+        return np.append(self.counts, self.missing)
+
+    def ks(self, reference):
+        """Largest gap between the binned CDFs (non-missing values only)"""
+        if self.counts.sum() == 0 or reference.counts.sum() == 0:
+            return np.nan
+        cdf = np.cumsum(self.counts) / self.counts.sum()
+        reference_cdf = np.cumsum(reference.counts) / reference.counts.sum()
+        return float(np.max(np.abs(cdf - reference_cdf)))
+
+
+class CategoricalSketch:
+    """Counts for the known categories plus an unseen-category counter"""
+
+    def __init__(self, categories, max_unseen_examples=20):
+        self.categories = list(categories)
+        self.index = {category: i for i, category in enumerate(self.categories)}
+        self.counts = np.zeros(len(self.categories), dtype=np.int64)
+        self.missing = 0
+        self.unseen = 0
+        # A bounded sample of unseen values for debugging
+        self.max_unseen_examples = max_unseen_examples
+        self.unseen_examples = {}
+
+    @classmethod
+    def from_values(cls, values):
+        values = pd.Series(values)
+        sketch = cls(sorted(values.dropna().astype(str).unique()))
+        sketch.update(values)
+        return sketch
+
+    def empty_copy(self):
+        return CategoricalSketch(self.categories, self.max_unseen_examples)
+
+    def update(self, values):
+        values = pd.Series(values)
+        self.missing += int(values.isna().sum())
+        for category, count in values.dropna().astype(str).value_counts().items():
+            if category in self.index:
+                self.counts[self.index[category]] += count
+            else:
+                self.unseen += int(count)
+                if category in self.unseen_examples or len(self.unseen_examples) < self.max_unseen_examples:
+                    self.unseen_examples[category] = self.unseen_examples.get(category, 0) + int(count)
+
+    def add(self, value):
+        """Single-value update without building a Series"""
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            self.missing += 1
+        elif str(value) in self.index:
+            self.counts[self.index[str(value)]] += 1
+        else:
+            self.unseen += 1
+            if str(value) in self.unseen_examples or len(self.unseen_examples) < self.max_unseen_examples:
+                self.unseen_examples[str(value)] = self.unseen_examples.get(str(value), 0) + 1
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.missing += other.missing
+        self.unseen += other.unseen
+        for category, count in other.unseen_examples.items():
+            if category in self.unseen_examples or len(self.unseen_examples) < self.max_unseen_examples:
+                self.unseen_examples[category] = self.unseen_examples.get(category, 0) + count
+
+    @property
+    def n(self):
+        return int(self.counts.sum()) + self.missing + self.unseen
+
+    def distribution(self):
+        """Category counts with unseen and missing as final buckets"""
+        return np.append(self.counts, [self.unseen, self.missing])
+
+    def ks(self, reference):
+        return np.nan
+
+
+def psi(expected, actual):
+    """Population stability index between two count vectors"""
+    if expected.sum() == 0 or actual.sum() == 0:
+        return np.nan
+    expected = np.maximum(expected / expected.sum(), EPSILON)
+    actual = np.maximum(actual / actual.sum(), EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+class DriftMonitor:
+    """Streaming input and prediction sketches compared against a training reference"""
+
+    def __init__(self, reference):
+        """Start an empty live monitor with the same bins as the reference"""
+        self.reference = reference
+        self.live = {name: sketch.empty_copy() for name, sketch in reference.items()}
+
+    @staticmethod
+    def build_reference(train_df, predictions, n_bins=20):
+        """Reference sketches for every raw input feature and for the predictions"""
+        reference = {}
+        for col in train_df.columns.drop(['Id', 'SalePrice'], errors='ignore'):
+            if pd.api.types.is_numeric_dtype(train_df[col]):
+                reference[col] = NumericSketch.from_values(train_df[col], n_bins)
+            else:
+                reference[col] = CategoricalSketch.from_values(train_df[col])
+        reference['prediction'] = NumericSketch.from_values(predictions, n_bins)
+        return reference
+
+    @classmethod
+    def load(cls, path='models/drift_reference.pkl'):
+        return cls(joblib.load(path))
+
+    def observe_inputs(self, input_data):
+        """Add raw request records (dict or DataFrame) to the live sketches"""
+        if isinstance(input_data, dict):
+            for col, value in input_data.items():
+                if col in self.live and col != 'prediction':
+                    self.live[col].add(value)
+            return
+        for col in input_data.columns:
+            if col in self.live and col != 'prediction':
+                self.live[col].update(input_data[col])
+
+    def observe_predictions(self, predictions):
+        self.live['prediction'].update(np.atleast_1d(predictions))
+
+    def merge(self, other):
+        """Fold in the live sketches of another monitor, e.g. from another worker"""
+        for name, sketch in other.live.items():
+            self.live[name].merge(sketch)
+
+    def report(self):
+        """PSI, KS and unseen-category counts per feature, worst drift first"""
+        rows = []
+        for name, live in self.live.items():
+            reference = self.reference[name]
+            rows.append({
+                'feature': name,
+                'n': live.n,
+                'psi': psi(reference.distribution(), live.distribution()),
+                'ks': live.ks(reference),
+                'missing': live.missing,
+                'unseen': getattr(live, 'unseen', 0)
+            })
+        return pd.DataFrame(rows).sort_values('psi', ascending=False).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    # Example usage: replay test.csv through a monitored predictor
+    from predict import HousePricePredictor
+
+    predictor = HousePricePredictor(drift_reference='models/drift_reference.pkl')
+    predictor.predict_batch(pd.read_csv('test.csv'))
+    print(predictor.drift_monitor.report().head(15).to_string(index=False))
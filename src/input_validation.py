@@ -0,0 +1,142 @@
+"""
+Input Validation Module
+Vectorized checks over whole batches, with rules taken from data_description.txt
+and INPUT_FIELDS_GUIDE.md; failing rows go to a quarantine file with their
+reasons instead of being silently median-filled or encoded as unknown
+"""
+
+import os
+import re
+import pandas as pd
+
+
+# Documented ranges of the numeric fields in INPUT_FIELDS_GUIDE.md
+NUMERIC_RANGES = {
+    'OverallQual': (1, 10),
+    'OverallCond': (1, 10),
+    'YearBuilt': (1872, 2024),
+    'YearRemodAdd': (1872, 2024),
+    'GrLivArea': (300, 6000),
+    'TotalBsmtSF': (0, 3000),
+    '1stFlrSF': (300, 5000),
+    '2ndFlrSF': (0, 2000),
+    'LotArea': (1300, 100000),
+    'BedroomAbvGr': (0, 10),
+    'FullBath': (0, 5),
+    'HalfBath': (0, 3),
+    'BsmtFullBath': (0, 3),
+    'BsmtHalfBath': (0, 2),
+    'GarageCars': (0, 5),
+    'GarageArea': (0, 1500),
+    'Fireplaces': (0, 4),
+    'MoSold': (1, 12)
+}
+
+# Values the data files spell differently from data_description.txt
+DATA_SPELLINGS = {
+    'MSZoning': ['C (all)'],
+    'Neighborhood': ['NAmes'],
+    'BldgType': ['2fmCon', 'Duplex', 'Twnhs'],
+    'Exterior2nd': ['Brk Cmn', 'CmentBd', 'Wd Shng']
+}
+
+# Houses can be sold the year before construction or a remodel finishes
+YEAR_ORDER = [
+    ('YearBuilt', 'YearRemodAdd', 0),
+    ('YearBuilt', 'YrSold', 1),
+    ('YearRemodAdd', 'YrSold', 1),
+    ('GarageYrBlt', 'YrSold', 1)
+]
+
+BASEMENT_PARTS = ['BsmtFinSF1', 'BsmtFinSF2', 'BsmtUnfSF']
+
+
+def parse_data_description(path='data_description.txt'):
+    """Field name -> list of codes listed under it in data_description.txt"""
+    fields = {}
+    field = None
+    with open(path) as f:
+        for line in f:
+            header = re.match(r'^(\w+):\s', line)
+            if header:
+                field = header.group(1)
+                fields[field] = []
+            elif field and line[:1].isspace() and '\t' in line.strip():
+                fields[field].append(line.strip().split('\t')[0].strip())
+    return fields
+
+
+class InputValidator:
+    """Column-wise rule checks over batches, quarantining rows that fail"""
+
+    def __init__(self, description_path='data_description.txt', quarantine_path='models/quarantine.csv'):
+        """Build the allowed values for every coded field in the description"""
+        self.quarantine_path = quarantine_path
+        self.allowed = {}
+        for field, codes in parse_data_description(description_path).items():
+            # 'NA' marks a missing feature, which is read in as a missing value
+            codes = [code for code in codes if code and code != 'NA']
+            if not codes:
+                continue
+            if all(code.isdigit() for code in codes):
+                self.allowed[field] = {int(code) for code in codes}
+            else:
+                self.allowed[field] = set(codes) | set(DATA_SPELLINGS.get(field, []))
+
+    def check(self, df):
+        """Boolean frame with one column per rule, True where a row fails it"""
+        failures = {}
+        for col, allowed in self.allowed.items():
+            if col in df.columns:
+                failures[f'{col} not a documented value'] = df[col].notna() & ~df[col].isin(allowed)
+
+        for col, (low, high) in NUMERIC_RANGES.items():
+            if col in df.columns:
+                failures[f'{col} outside [{low}, {high}]'] = (df[col] < low) | (df[col] > high)
+
+        for earlier, later, slack in YEAR_ORDER:
+            if earlier in df.columns and later in df.columns:
+                failures[f'{earlier} after {later}'] = df[earlier] > df[later] + slack
+
+        if all(col in df.columns for col in ['TotalBsmtSF'] + BASEMENT_PARTS):
+            # Comparisons with missing values are False, so incomplete rows pass
+            mismatch = (df['TotalBsmtSF'] - df[BASEMENT_PARTS].sum(axis=1, min_count=len(BASEMENT_PARTS))).abs()
+            failures['TotalBsmtSF != ' + ' + '.join(BASEMENT_PARTS)] = mismatch > 1
+
+        return pd.DataFrame(failures, index=df.index)
+
+    def validate(self, df):
+        """Valid rows of df; failing rows are appended to the quarantine file"""
+        failures = self.check(df)
+        failed = failures.any(axis=1)
+        if not failed.any():
+            return df
+
+        quarantined = df[failed].copy()
+        # Only the (few) failing rows get their reasons spelled out
+        quarantined['reasons'] = failures[failed].apply(lambda row: '; '.join(row.index[row]), axis=1)
+        self._quarantine(quarantined)
+        return df[~failed]
+
+    def validate_csv(self, source_path='test.csv', chunk_size=50_000):
+        """Yield the valid rows of a CSV file chunk by chunk"""
+        for chunk in pd.read_csv(source_path, chunksize=chunk_size):
+            yield self.validate(chunk)
+
+    def _quarantine(self, quarantined):
+        directory = os.path.dirname(self.quarantine_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        quarantined.to_csv(self.quarantine_path, mode='a', index=False,
+                           header=not os.path.exists(self.quarantine_path))
+        print(f"⚠️  {len(quarantined)} rows quarantined to '{self.quarantine_path}'")
+
+
+if __name__ == "__main__":
+    # Example usage: validate test.csv in chunks and summarise the quarantine
+    validator = InputValidator()
+    n_valid = sum(len(chunk) for chunk in validator.validate_csv('test.csv', chunk_size=500))
+    print(f"✅ {n_valid} valid rows")
+
+    if os.path.exists(validator.quarantine_path):
+        print(pd.read_csv(validator.quarantine_path)[['Id', 'reasons']].to_string(index=False))
@@ -0,0 +1,249 @@
+"""
+Load Testing Module
+Replays test.csv records against the in-process predictor or an HTTP endpoint
+on an open-loop arrival schedule, measuring latency from each request's
+intended send time so queueing under overload is not hidden
+"""
+
+import time
+import json
+import argparse
+import threading
+import collections
+import urllib.request
+import numpy as np
+import pandas as pd
+
+
+def constant_arrivals(rate, duration):
+    """Send times (seconds from start) at a fixed rate"""
+    return np.arange(0, duration, 1 / rate)
+
+
+def poisson_arrivals(rate, duration, random_state=42):
+    """Send times with exponential gaps, i.e. bursty traffic averaging rate per second"""
+    rng = np.random.default_rng(random_state)
+    times = np.cumsum(rng.exponential(1 / rate, size=int(rate * duration * 1.5) + 10))
+    return times[times < duration]
+
+
+def step_arrivals(rates, step_duration):
+    """Constant arrivals whose rate steps through rates, step_duration seconds each"""
+    return np.concatenate([
+        i * step_duration + constant_arrivals(rate, step_duration)
+        for i, rate in enumerate(rates)
+    ])
+
+
+class LatencyHistogram:
+    """Log-spaced latency buckets (about 1% wide) from 10 µs to 100 s"""
+
+    EDGES_MS = np.geomspace(0.01, 100_000, 1600)
+
+    def __init__(self):
+        self.counts = np.zeros(len(self.EDGES_MS) + 1, dtype=np.int64)
+        self.max_ms = 0.0
+
+    def record(self, latency_ms):
+        self.counts[np.searchsorted(self.EDGES_MS, latency_ms)] += 1
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th percentile"""
+        if self.n == 0:
+            return np.nan
+        bucket = np.searchsorted(np.cumsum(self.counts), q / 100 * self.n)
+        return min(self.EDGES_MS[min(bucket, len(self.EDGES_MS) - 1)], self.max_ms)
+
+    def distribution(self):
+        """Non-empty buckets with their cumulative percentile"""
+        upper = np.append(self.EDGES_MS, np.inf)
+        cumulative = np.cumsum(self.counts) / max(self.n, 1) * 100
+        nonzero = self.counts > 0
+        return pd.DataFrame({
+            'upper_ms': np.minimum(upper[nonzero], self.max_ms),
+            'count': self.counts[nonzero],
+            'percentile': cumulative[nonzero]
+        })
+
+
+class RecordSource:
+    """Cycles through test.csv records, randomly mutating fields"""
+
+    def __init__(self, path='test.csv', mutation_rate=0.0, random_state=42):
+        self.df = pd.read_csv(path)
+        self.records = self.df.to_dict('records')
+        self.mutation_rate = mutation_rate
+        self.rng = np.random.default_rng(random_state)
+        self.categories = {
+            col: self.df[col].dropna().unique().tolist() + ['Unknown']
+            for col in self.df.select_dtypes(include=['object']).columns
+        }
+
+    def take(self, n):
+        """n records, cycling through the file, with mutations applied"""
+        return [self.mutate(self.records[i % len(self.records)]) for i in range(n)]
+
+    def mutate(self, record):
+        """Rescale numbers, swap or blank categories, each with probability mutation_rate"""
+        if self.mutation_rate <= 0:
+            return record
+        record = dict(record)
+        for col, value in record.items():
+            if col == 'Id' or self.rng.random() >= self.mutation_rate:
+                continue
+            if self.rng.random() < 0.1:
+                record[col] = None if col in self.categories else np.nan
+            elif col in self.categories:
+                record[col] = self.categories[col][self.rng.integers(len(self.categories[col]))]
+            elif not pd.isna(value):
+                record[col] = type(value)(value * self.rng.uniform(0.5, 1.5))
+        return record
+
+
+class InProcessTarget:
+    """Calls HousePricePredictor.predict directly"""
+
+    def __init__(self, predictor=None):
+        if predictor is None:
+            from predict import HousePricePredictor
+            predictor = HousePricePredictor()
+        self.predictor = predictor
+
+    def __call__(self, record):
+        return self.predictor.predict(dict(record))
+
+
+class HttpTarget:
+    """POSTs each record as JSON to a prediction endpoint"""
+
+    def __init__(self, url, timeout=10.0):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, record):
+        body = json.dumps({
+            col: None if isinstance(value, float) and np.isnan(value) else value
+            for col, value in record.items()
+        }).encode()
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+
+class LoadGenerator:
+    """Open-loop load: requests go out on schedule whether or not earlier ones have returned"""
+
+    def __init__(self, target, source, concurrency=8):
+        self.target = target
+        self.source = source
+        self.concurrency = concurrency
+
+    def run(self, arrivals):
+        """Send one request per arrival time and return the summary report"""
+        arrivals = np.asarray(arrivals)
+        print(f"Sending {len(arrivals):,} requests over {arrivals[-1]:.1f}s "
+              f"with {self.concurrency} concurrent workers...")
+        queue = collections.deque(zip(arrivals, self.source.take(len(arrivals))))
+        start = time.perf_counter() + 0.1
+        workers = [self._worker_stats() for _ in range(self.concurrency)]
+
+        def work(stats):
+            while True:
+                try:
+                    intended, record = queue.popleft()
+                except IndexError:
+                    return
+                intended += start
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                sent = time.perf_counter()
+                try:
+                    self.target(record)
+                except Exception as e:
+                    stats['errors'][type(e).__name__] += 1
+                    continue
+                done = time.perf_counter()
+                # Response time counts the wait for a free worker; service time does not
+                stats['response'].record((done - intended) * 1000)
+                stats['service'].record((done - sent) * 1000)
+
+        threads = [threading.Thread(target=work, args=(stats,)) for stats in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        self.response, self.service = LatencyHistogram(), LatencyHistogram()
+        self.errors = collections.Counter()
+        for stats in workers:
+            self.response.merge(stats['response'])
+            self.service.merge(stats['service'])
+            self.errors.update(stats['errors'])
+        return self.report(len(arrivals), arrivals[-1], elapsed)
+
+    def report(self, n_requests, schedule_s, elapsed_s):
+        """Throughput, error rate and latency percentiles"""
+        n_errors = sum(self.errors.values())
+        summary = {
+            'requests': n_requests,
+            'errors': n_errors,
+            'error_rate': n_errors / n_requests,
+            'errors_by_type': dict(self.errors),
+            'offered_rps': n_requests / schedule_s if schedule_s > 0 else np.nan,
+            'throughput_rps': (n_requests - n_errors) / elapsed_s
+        }
+        for name, histogram in [('response', self.response), ('service', self.service)]:
+            for q in [50, 90, 99, 99.9]:
+                summary[f'{name}_p{q:g}_ms'] = histogram.percentile(q)
+            summary[f'{name}_max_ms'] = histogram.max_ms
+        return summary
+
+    @staticmethod
+    def _worker_stats():
+        return {'response': LatencyHistogram(), 'service': LatencyHistogram(), 'errors': collections.Counter()}
+
+
+def main():
+    """Run a load test from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', help='HTTP endpoint to POST records to (default: in-process predictor)')
+    parser.add_argument('--schedule', choices=['constant', 'poisson', 'step'], default='poisson')
+    parser.add_argument('--rate', type=float, default=50, help='requests per second (step: starting rate)')
+    parser.add_argument('--duration', type=float, default=30, help='seconds (step: per step)')
+    parser.add_argument('--steps', type=int, default=4, help='number of rate steps, each one rate higher')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--mutation-rate', type=float, default=0.0)
+    parser.add_argument('--data', default='test.csv')
+    args = parser.parse_args()
+
+    if args.schedule == 'constant':
+        arrivals = constant_arrivals(args.rate, args.duration)
+    elif args.schedule == 'poisson':
+        arrivals = poisson_arrivals(args.rate, args.duration)
+    else:
+        arrivals = step_arrivals([args.rate * (i + 1) for i in range(args.steps)], args.duration)
+
+    target = HttpTarget(args.url) if args.url else InProcessTarget()
+    generator = LoadGenerator(target, RecordSource(args.data, args.mutation_rate), args.concurrency)
+    summary = generator.run(arrivals)
+
+    print("\n=== LOAD TEST RESULTS ===")
+    for key, value in summary.items():
+        print(f"{key:>20}: {value:,.2f}" if isinstance(value, float) else f"{key:>20}: {value}")
+    print("\nResponse time distribution (from intended send time):")
+    print(generator.response.distribution().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Multi-Model Scoring Module
+Preprocesses each batch once and scores it with every saved model, plus a
+weighted-average ensemble fit on the validation split
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import joblib
+from predict import HousePricePredictor
+from stacking import StackedModel
+
+
+class MultiModelScorer(HousePricePredictor):
+    """Score one preprocessed batch with many models"""
+
+    def __init__(self, model_names=None, artifacts_dir='models'):
+        """Load every requested model and the shared preprocessors"""
+        print("Loading models and preprocessors...")
+        results = joblib.load(os.path.join(artifacts_dir, 'training_results.pkl'))
+        model_names = model_names or list(results)
+
+        self.models = {
+            name: joblib.load(os.path.join(artifacts_dir, f"{name.lower().replace(' ', '_')}.pkl"))
+            for name in model_names
+        }
+        self.scaler = joblib.load(os.path.join(artifacts_dir, 'scaler.pkl'))
+        self.label_encoders = joblib.load(os.path.join(artifacts_dir, 'label_encoders.pkl'))
+        self.feature_names = joblib.load(os.path.join(artifacts_dir, 'feature_names.pkl'))
+        fill_values_path = os.path.join(artifacts_dir, 'fill_values.pkl')
+        if os.path.exists(fill_values_path):
+            self.fill_values = joblib.load(fill_values_path)
+
+        # Fall back to a plain average if no weights were fit for these models; stacked
+        # models already blend the others and are never averaged with them
+        weights_path = os.path.join(artifacts_dir, 'ensemble_weights.pkl')
+        weights = joblib.load(weights_path) if os.path.exists(weights_path) else {}
+        self.set_weights({
+            name: 0.0 if isinstance(model, StackedModel) else weights.get(name, 1.0 if not weights else 0.0)
+            for name, model in self.models.items()
+        })
+
+        # Inherited single-model methods use the highest-weighted model
+        self.model = self.models[max(self.weights, key=self.weights.get)]
+        print(f"✅ Loaded {len(self.models)} models: {', '.join(self.models)}")
+
+    def set_weights(self, weights):
+        """Set ensemble weights, renormalised over the loaded models"""
+        total = sum(weights.values())
+        if total <= 0:
+            weights = {name: 0.0 if isinstance(model, StackedModel) else 1.0 for name, model in self.models.items()}
+            total = sum(weights.values())
+        self.weights = {name: weights.get(name, 0.0) / total for name in self.models}
+
+    def add_model(self, name, model, weight=0.0):
+        """Add a challenger with a weight relative to the current total of 1"""
+        self.models[name] = model
+        self.set_weights({**self.weights, name: weight})
+
+    def score(self, input_data):
+        """Per-model predictions plus the weighted ensemble, one row per input record"""
+        # One preprocessing pass; each extra model only adds its own predict cost
+        if isinstance(input_data, pd.DataFrame):
+            input_data = input_data.copy()
+        X = self.preprocess_input(input_data)
+
+        scores = pd.DataFrame({
+            name: model.predict(X) for name, model in self.models.items() if not isinstance(model, StackedModel)
+        })
+        # Stacked models reuse the base predictions above when all their base models are loaded
+        for name, model in self.models.items():
+            if isinstance(model, StackedModel):
+                bases = list(model.base_models_)
+                base_predictions = scores[bases].values if set(bases) <= set(scores) else model.base_predictions(X)
+                scores[name] = model.meta_model_.predict(base_predictions)
+        scores = scores[list(self.models)]
+        scores['Ensemble'] = scores[list(self.models)].values @ np.array(list(self.weights.values()))
+        return scores
+
+
+if __name__ == "__main__":
+    # Example usage
+    scorer = MultiModelScorer()
+    print(scorer.score(pd.read_csv('test.csv').head()))
@@ -0,0 +1,70 @@
+"""
+One-Hot Ridge Module
+Ridge regression that one-hot encodes the label-encoded columns into a sparse
+block and keeps the numeric columns dense, solving the normal equations block
+by block instead of running an iterative sparse solver over the whole matrix
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import solve
+from sklearn.base import BaseEstimator, RegressorMixin
+
+
+class OneHotRidge(BaseEstimator, RegressorMixin):
+    """Ridge over a sparse one-hot block of categorical codes and the dense numeric columns"""
+
+    def __init__(self, categorical_indices=(), alpha=1.0):
+        self.categorical_indices = categorical_indices
+        self.alpha = alpha
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.numeric_indices_ = [i for i in range(X.shape[1]) if i not in self.categorical_indices]
+        # One one-hot column per code seen in training; unseen codes get no column, like handle_unknown='ignore'
+        self.categories_ = [np.unique(X[:, i]) for i in self.categorical_indices]
+        self.offsets_ = np.cumsum([0] + [len(categories) for categories in self.categories_])
+        self.n_one_hot_ = int(self.offsets_[-1])
+
+        one_hot = self._one_hot(X)
+        numeric = X[:, self.numeric_indices_]
+        one_hot_sums = np.asarray(one_hot.sum(axis=0)).ravel()
+        numeric_sums = numeric.sum(axis=0)
+        cross = np.asarray(one_hot.T @ numeric)
+
+        # Gram matrix of [intercept, one-hot, numeric]; only the small one-hot x one-hot block is densified
+        gram = np.block([
+            [np.array([[len(X)]]), one_hot_sums[None, :], numeric_sums[None, :]],
+            [one_hot_sums[:, None], (one_hot.T @ one_hot).toarray(), cross],
+            [numeric_sums[:, None], cross.T, numeric.T @ numeric]
+        ])
+        target = np.concatenate([[y.sum()], one_hot.T @ y, numeric.T @ y])
+
+        # The intercept is not penalised, as in Ridge(fit_intercept=True)
+        penalty = np.full(len(target), float(self.alpha))
+        penalty[0] = 0
+        coef = solve(gram + np.diag(penalty), target, assume_a='pos')
+        self.intercept_ = coef[0]
+        self.one_hot_coef_ = coef[1:1 + self.n_one_hot_]
+        self.coef_ = coef[1 + self.n_one_hot_:]
+        return self
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=float)
+        return self.intercept_ + self._one_hot(X) @ self.one_hot_coef_ + X[:, self.numeric_indices_] @ self.coef_
+
+    def _one_hot(self, X):
+        """CSR one-hot block of the categorical columns"""
+        codes = X[:, self.categorical_indices]
+        positions = np.empty(codes.shape, dtype=int)
+        known = np.empty(codes.shape, dtype=bool)
+        for j, categories in enumerate(self.categories_):
+            positions[:, j] = np.minimum(np.searchsorted(categories, codes[:, j]), len(categories) - 1)
+            known[:, j] = categories[positions[:, j]] == codes[:, j]
+
+        rows, columns = np.nonzero(known)
+        return sp.csr_matrix(
+            (np.ones(len(rows)), (rows, self.offsets_[columns] + positions[rows, columns])),
+            shape=(len(X), self.n_one_hot_)
+        )
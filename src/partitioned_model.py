@@ -0,0 +1,190 @@
+"""
+Partitioned Model Module
+Trains one model per neighborhood (or cluster of neighborhoods) in parallel
+worker processes and routes each request to its partition's model, falling
+back to the global model for small or unseen partitions
+"""
+
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error
+
+
+PARTITION_COLUMN = 'Neighborhood'
+GLOBAL = 'global'
+
+
+def _fit_partition(key, estimator, X, y):
+    """Fit one partition's model (runs in a worker process)"""
+    return key, clone(estimator).fit(X, y)
+
+
+class NeighborhoodRouter:
+    """Estimator that sends each row to its partition's model"""
+
+    def __init__(self, column_index, mean, scale, assignments, partitions, global_model, fingerprints):
+        self.column_index = column_index
+        # Statistics of the scaler the incoming rows were scaled with
+        self.mean = mean
+        self.scale = scale
+        # Neighborhood code -> partition key; codes missing here go to the global model
+        self.assignments = assignments
+        # Partition key -> {'model', 'mean', 'scale'}, with the scaling that model was trained on
+        self.partitions = partitions
+        self.global_model = global_model
+        self.fingerprints = fingerprints
+
+    def partition_keys(self, X):
+        """Partition key per row, recovered from the scaled Neighborhood code"""
+        codes = np.rint(np.asarray(X, dtype=float)[:, self.column_index] * self.scale[self.column_index]
+                        + self.mean[self.column_index]).astype(int)
+        return np.array([self.assignments.get(code, GLOBAL) for code in codes])
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=float)
+        keys = self.partition_keys(X)
+        predictions = np.empty(len(X))
+        for key in np.unique(keys):
+            rows = keys == key
+            if key not in self.partitions:
+                predictions[rows] = self.global_model.predict(X[rows])
+                continue
+            # A reused partition model may predate the current scaler, so rescale to its own
+            partition = self.partitions[key]
+            unscaled = X[rows] * self.scale + self.mean
+            predictions[rows] = partition['model'].predict((unscaled - partition['mean']) / partition['scale'])
+        return predictions
+
+
+class PartitionedTrainer:
+    """Fit, incrementally refit and save per-partition models"""
+
+    def __init__(self, scaler, label_encoders, feature_names, min_rows=50, n_clusters=None, n_jobs=-1,
+                 output_dir='models/partitioned'):
+        self.scaler = scaler
+        self.label_encoders = label_encoders
+        self.feature_names = feature_names
+        self.min_rows = min_rows
+        self.n_clusters = n_clusters
+        self.n_jobs = n_jobs
+        self.output_dir = output_dir
+        self.router = None
+
+    def assign_partitions(self, codes, y):
+        """Map each neighborhood code to a partition key; partitions under min_rows use the global model"""
+        frame = pd.DataFrame({'code': codes, 'y': np.asarray(y)})
+        if self.n_clusters:
+            # Group neighborhoods with similar median prices
+            medians = frame.groupby('code')['y'].median().sort_values()
+            clusters = pd.qcut(np.arange(len(medians)), min(self.n_clusters, len(medians)), labels=False)
+            keys = {code: f'cluster_{cluster}' for code, cluster in zip(medians.index, clusters)}
+        else:
+            names = self.label_encoders[PARTITION_COLUMN].classes_
+            keys = {code: names[code] for code in frame['code'].unique()}
+
+        sizes = frame['code'].map(keys).value_counts()
+        return {int(code): key if sizes[key] >= self.min_rows else GLOBAL for code, key in keys.items()}
+
+    def fingerprint(self, estimator, raw_rows):
+        """Hash of a partition's raw rows, the category encodings and the estimator settings"""
+        digest = hashlib.sha256()
+        # Raw rows, before scaling and the random split, so other neighborhoods cannot change it
+        digest.update(pd.util.hash_pandas_object(raw_rows, index=False).values.tobytes())
+        digest.update(repr({col: list(le.classes_) for col, le in self.label_encoders.items()}).encode())
+        digest.update(repr(estimator.get_params()).encode())
+        return digest.hexdigest()[:16]
+
+    def fit(self, X_train, y_train, global_model, train_df, base_estimator=None):
+        """Train every partition whose raw data changed since the last run and save the router"""
+        print("\n=== TRAINING PARTITIONED MODELS ===")
+        os.makedirs(self.output_dir, exist_ok=True)
+        X = np.asarray(X_train, dtype=float)
+        y = np.asarray(y_train, dtype=float)
+        mean, scale = self.scaler.mean_, self.scaler.scale_
+
+        # Partitions are assigned from the raw training data, before the train/validation split
+        names = self.label_encoders[PARTITION_COLUMN].classes_
+        raw_codes = train_df[PARTITION_COLUMN].astype(str).map({name: i for i, name in enumerate(names)}).values
+        assignments = self.assign_partitions(raw_codes, train_df['SalePrice'])
+        raw_keys = np.array([assignments[code] for code in raw_codes])
+
+        column_index = self.feature_names.index(PARTITION_COLUMN)
+        codes = np.rint(X[:, column_index] * scale[column_index] + mean[column_index]).astype(int)
+        keys = np.array([assignments.get(code, GLOBAL) for code in codes])
+
+        # Partitions already run in parallel, so each model fits on a single core
+        estimator = clone(base_estimator if base_estimator is not None else global_model)
+        if 'n_jobs' in estimator.get_params(deep=False):
+            estimator.set_params(n_jobs=1)
+
+        router_path = os.path.join(self.output_dir, 'router.pkl')
+        previous = joblib.load(router_path).fingerprints if os.path.exists(router_path) else {}
+
+        partitions, fingerprints, jobs = {}, {}, []
+        for key in sorted(set(raw_keys) - {GLOBAL}):
+            fingerprints[key] = self.fingerprint(estimator, train_df[raw_keys == key])
+            model_path = self._model_path(key)
+            if previous.get(key) == fingerprints[key] and os.path.exists(model_path):
+                partitions[key] = joblib.load(model_path)
+            else:
+                rows = keys == key
+                jobs.append(delayed(_fit_partition)(key, estimator, X[rows], y[rows]))
+
+        print(f"{len(fingerprints)} partitions ({int((raw_keys == GLOBAL).sum())} rows left to the global model): "
+              f"reusing {len(partitions)}, retraining {len(jobs)}")
+        for key, model in Parallel(n_jobs=self.n_jobs)(jobs):
+            partitions[key] = {'model': model, 'mean': mean, 'scale': scale}
+            joblib.dump(partitions[key], self._model_path(key))
+
+        self.router = NeighborhoodRouter(column_index, mean, scale, assignments, partitions, global_model, fingerprints)
+        joblib.dump(self.router, router_path)
+        print(f"✅ Router saved to '{router_path}'")
+        return self.router
+
+    def evaluate(self, X_val, y_val):
+        """Validation RMSE of the router vs the global model, per partition and overall"""
+        X = np.asarray(X_val, dtype=float)
+        y = np.asarray(y_val, dtype=float)
+        keys = self.router.partition_keys(X)
+        routed = self.router.predict(X)
+        global_predictions = self.router.global_model.predict(X)
+
+        rows = []
+        for key in np.unique(keys):
+            mask = keys == key
+            rows.append({
+                'partition': key,
+                'n_val': int(mask.sum()),
+                'global_rmse': np.sqrt(mean_squared_error(y[mask], global_predictions[mask])),
+                'partitioned_rmse': np.sqrt(mean_squared_error(y[mask], routed[mask]))
+            })
+        report = pd.DataFrame(rows)
+        print("\n", report.to_string(index=False))
+        print(f"\nOverall validation RMSE: global ${np.sqrt(mean_squared_error(y, global_predictions)):,.2f}, "
+              f"partitioned ${np.sqrt(mean_squared_error(y, routed)):,.2f}")
+        return report
+
+    def _model_path(self, key):
+        return os.path.join(self.output_dir, f"partition_{key.lower().replace(' ', '_')}.pkl")
+
+
+if __name__ == "__main__":
+    # Example usage: retrain the partitions around the saved best model, then serve through the router
+    from data_preprocessing import HousePricePreprocessor
+    from predict import HousePricePredictor
+
+    preprocessor = HousePricePreprocessor()
+    preprocessor.load_data()
+    X_train, X_val, y_train, y_val = preprocessor.preprocess(save_preprocessor=False)
+
+    trainer = PartitionedTrainer(preprocessor.scaler, preprocessor.label_encoders, preprocessor.feature_names)
+    trainer.fit(X_train, y_train, joblib.load('models/best_model.pkl'), preprocessor.train_df)
+    trainer.evaluate(X_val, y_val)
+
+    predictor = HousePricePredictor('models/partitioned/router.pkl')
+    print(predictor.predict_batch(pd.read_csv('test.csv').head()))
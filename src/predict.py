@@ -6,19 +6,84 @@ Load trained model and make predictions on new data
 import pandas as pd
 import numpy as np
 import joblib
+import os
+import time
+from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor
+from score_table import ScoreTable, model_bundle_version
+from drift_monitor import DriftMonitor
+from input_validation import InputValidator
+
+
+def is_forest(model):
+    """Whether model averages independent trees; boosted models also have estimators_, but as stages"""
+    return isinstance(model, (RandomForestRegressor, ExtraTreesRegressor))
+
+
+def flatten_forest(model):
+    """All trees of a fitted forest as one flat node table with global child indices"""
+    return flatten_trees(model.estimators_)
+
+
+def flatten_trees(estimators):
+    """Flat node table of fitted scikit-learn decision trees, in order"""
+    trees = [est.tree_ for est in estimators]
+    offsets = np.cumsum([0] + [t.node_count for t in trees[:-1]])
+    
+    return {
+        'roots': offsets.astype(np.int64),
+        'children_left': np.concatenate([
+            np.where(t.children_left == -1, -1, t.children_left + off)
+            for t, off in zip(trees, offsets)
+        ]).astype(np.int64),
+        'children_right': np.concatenate([
+            np.where(t.children_right == -1, -1, t.children_right + off)
+            for t, off in zip(trees, offsets)
+        ]).astype(np.int64),
+        'feature': np.concatenate([t.feature for t in trees]).astype(np.int64),
+        'threshold': np.concatenate([t.threshold for t in trees]).astype(np.float64),
+        'missing_go_to_left': np.concatenate([
+            np.asarray(getattr(t, 'missing_go_to_left', np.zeros(t.node_count)), dtype=bool)
+            for t in trees
+        ]),
+        'value': np.concatenate([t.value[:, 0, 0] for t in trees]).astype(np.float64),
+        'max_depth': max(t.max_depth for t in trees)
+    }
 
 
 class HousePricePredictor:
     """Make predictions using trained model"""
     
-    def __init__(self, model_path='models/best_model.pkl'):
+    score_table = None
+    drift_monitor = None
+    validator = None
+    fill_values = None
+    
+    def __init__(self, model_path='models/best_model.pkl', artifacts_dir='models', score_table_dir=None,
+                 drift_reference=None, quarantine_path=None):
         """Load trained model and preprocessors"""
         print("Loading model and preprocessors...")
         self.model = joblib.load(model_path)
-        self.scaler = joblib.load('models/scaler.pkl')
-        self.label_encoders = joblib.load('models/label_encoders.pkl')
-        self.feature_names = joblib.load('models/feature_names.pkl')
+        self.scaler = joblib.load(os.path.join(artifacts_dir, 'scaler.pkl'))
+        self.label_encoders = joblib.load(os.path.join(artifacts_dir, 'label_encoders.pkl'))
+        self.feature_names = joblib.load(os.path.join(artifacts_dir, 'feature_names.pkl'))
+        # Training medians and modes; older bundles without them fall back to the scaler's training means
+        fill_values_path = os.path.join(artifacts_dir, 'fill_values.pkl')
+        if os.path.exists(fill_values_path):
+            self.fill_values = joblib.load(fill_values_path)
         print("✅ Model loaded successfully!")
+        
+        # Precomputed predictions by Id, rebuilt if they came from a different model bundle
+        if score_table_dir is not None:
+            self.version = model_bundle_version(model_path, artifacts_dir)
+            self.score_table = ScoreTable.attach(self, score_table_dir)
+        
+        # Streaming sketches of live inputs and predictions, compared with train.csv
+        if drift_reference is not None:
+            self.drift_monitor = DriftMonitor.load(drift_reference)
+        
+        # Batch inputs that break the documented rules are quarantined instead of scored
+        if quarantine_path is not None:
+            self.validator = InputValidator(quarantine_path=quarantine_path)
     
     def preprocess_input(self, input_data):
         """Preprocess input data for prediction"""
@@ -26,16 +91,19 @@ class HousePricePredictor:
         if isinstance(input_data, dict):
             input_data = pd.DataFrame([input_data])
         
-        # Handle missing values
-        numerical_cols = input_data.select_dtypes(include=[np.number]).columns
-        for col in numerical_cols:
-            if input_data[col].isnull().sum() > 0:
-                input_data[col].fillna(input_data[col].median(), inplace=True)
-        
-        categorical_cols = input_data.select_dtypes(include=['object']).columns
-        for col in categorical_cols:
-            if input_data[col].isnull().sum() > 0:
-                input_data[col].fillna('None', inplace=True)
+        # Handle missing values with training statistics, so a row's result does not depend on its batch
+        # (categoricals are known by their encoders: a single record's missing category is a float NaN)
+        categorical_cols = [col for col in self.label_encoders if col in input_data.columns]
+        fill_values = self.fill_values
+        if fill_values is None:
+            fill_values = {
+                col: mean for col, mean in zip(self.feature_names, self.scaler.mean_)
+                if col not in self.label_encoders
+            }
+        input_data = input_data.fillna(
+            {col: value for col, value in fill_values.items() if col in input_data.columns}
+        )
+        input_data[categorical_cols] = input_data[categorical_cols].fillna('None')
         
         # Feature engineering
         input_data['TotalSF'] = input_data['TotalBsmtSF'] + input_data['1stFlrSF'] + input_data['2ndFlrSF']
@@ -47,10 +115,9 @@ class HousePricePredictor:
         # Encode categorical variables
         for col in categorical_cols:
             if col in self.label_encoders:
-                le = self.label_encoders[col]
-                input_data[col] = input_data[col].astype(str).apply(
-                    lambda x: le.transform([x])[0] if x in le.classes_ else -1
-                )
+                # Dictionary lookup gives the same codes as le.transform without a call per value
+                codes = {label: i for i, label in enumerate(self.label_encoders[col].classes_)}
+                input_data[col] = input_data[col].astype(str).map(codes).fillna(-1).astype(int)
         
         # Drop ID if exists
         if 'Id' in input_data.columns:
@@ -70,40 +137,228 @@ class HousePricePredictor:
     
     def predict(self, input_data):
         """Make prediction on input data"""
+        cached = self._lookup(input_data)
+        if cached is not None:
+            return cached['prediction']
+        
         # Preprocess
+        self._observe_inputs(input_data)
         X = self.preprocess_input(input_data)
         
         # Predict
         prediction = self.model.predict(X)
+        self._observe_predictions(prediction)
         
         return prediction[0]
     
-    def predict_with_confidence(self, input_data):
-        """Make prediction with confidence interval (for Random Forest)"""
+    def predict_with_confidence(self, input_data, return_features=False):
+        """Make prediction with confidence interval (for Random Forest)
+
+        With return_features, the result also holds the preprocessed row under 'features'
+        (unless it came from the score table), for passing on to explain.
+        """
+        cached = self._lookup(input_data)
+        if cached is not None:
+            return cached
+        
+        self._observe_inputs(input_data)
         X = self.preprocess_input(input_data)
         
         # Main prediction
         prediction = self.model.predict(X)[0]
+        self._observe_predictions(prediction)
         
         # If Random Forest, get predictions from all trees
-        if hasattr(self.model, 'estimators_'):
+        if is_forest(self.model):
             tree_predictions = np.array([tree.predict(X)[0] for tree in self.model.estimators_])
             std = np.std(tree_predictions)
             lower_bound = prediction - 1.96 * std
             upper_bound = prediction + 1.96 * std
             
-            return {
+            result = {
                 'prediction': prediction,
                 'lower_bound': max(0, lower_bound),
                 'upper_bound': upper_bound,
                 'confidence_interval': (lower_bound, upper_bound)
             }
         else:
-            return {
+            result = {
                 'prediction': prediction,
                 'lower_bound': None,
                 'upper_bound': None
             }
+        
+        if return_features:
+            result['features'] = X
+        return result
+    
+    def predict_batch(self, input_data):
+        """Score a whole DataFrame at once, returning Id, prediction and interval per row"""
+        if self.validator is not None:
+            input_data = self.validator.validate(input_data)
+        ids = input_data['Id'].values if 'Id' in input_data.columns else input_data.index.values
+        if len(input_data) == 0:
+            # Every row was quarantined
+            return pd.DataFrame({'Id': ids, 'prediction': [], 'lower_bound': [], 'upper_bound': []})
+        self._observe_inputs(input_data)
+        X = self.preprocess_input(input_data.copy())
+        
+        tree_predictions = self._tree_predictions(X)
+        if tree_predictions is not None:
+            prediction = tree_predictions.mean(axis=1)
+            std = tree_predictions.std(axis=1)
+            lower_bound = np.maximum(0, prediction - 1.96 * std)
+            upper_bound = prediction + 1.96 * std
+        else:
+            prediction = self.model.predict(X)
+            lower_bound = upper_bound = np.full(len(prediction), np.nan)
+        self._observe_predictions(prediction)
+        
+        return pd.DataFrame({
+            'Id': ids,
+            'prediction': prediction,
+            'lower_bound': lower_bound,
+            'upper_bound': upper_bound
+        })
+    
+    def predict_anytime(self, input_data, block_size=25, ci_tolerance=0.02, mean_tolerance=None,
+                        deadline_ms=None):
+        """Prediction with confidence interval from as few forest trees as the tolerances allow"""
+        start_time = time.perf_counter()
+        cached = self._lookup(input_data)
+        if cached is not None:
+            return {**cached, 'n_trees': 0, 'stopped_by': 'score_table'}
+        
+        n_trees = self._n_trees()
+        if n_trees is None:
+            return {**self.predict_with_confidence(input_data), 'n_trees': None, 'stopped_by': None}
+        
+        self._observe_inputs(input_data)
+        X = self.preprocess_input(input_data)
+        
+        # Evaluate trees a block at a time; scikit-learn's trees are exchangeable, so any prefix is a fair sample
+        tree_predictions = np.array([])
+        stopped_by = 'all_trees'
+        for start in range(0, n_trees, block_size):
+            previous_mean = tree_predictions.mean() if len(tree_predictions) else None
+            block = self._tree_predictions(X, slice(start, start + block_size))[0]
+            tree_predictions = np.append(tree_predictions, block)
+            if len(tree_predictions) >= n_trees:
+                break
+            
+            mean = tree_predictions.mean()
+            # Half-width of the 95% interval on the running mean, compared relative to the mean
+            half_width = 1.96 * tree_predictions.std() / np.sqrt(len(tree_predictions))
+            if ci_tolerance is not None and half_width <= ci_tolerance * abs(mean):
+                stopped_by = 'ci'
+                break
+            # Cheaper but noisier: a block can land near the previous mean by chance
+            if mean_tolerance is not None and previous_mean is not None \
+                    and abs(mean - previous_mean) <= mean_tolerance * abs(mean):
+                stopped_by = 'mean'
+                break
+            if deadline_ms is not None and (time.perf_counter() - start_time) * 1000 >= deadline_ms:
+                stopped_by = 'deadline'
+                break
+        
+        prediction = tree_predictions.mean()
+        self._observe_predictions(prediction)
+        std = np.std(tree_predictions)
+        lower_bound = prediction - 1.96 * std
+        upper_bound = prediction + 1.96 * std
+        
+        return {
+            'prediction': prediction,
+            'lower_bound': max(0, lower_bound),
+            'upper_bound': upper_bound,
+            'confidence_interval': (lower_bound, upper_bound),
+            'n_trees': len(tree_predictions),
+            'stopped_by': stopped_by
+        }
+    
+    def explain(self, input_data, top_n=5, X=None):
+        """Per-feature contributions to a single prediction, largest first
+
+        X is the already preprocessed row, if the caller has it, so it is not preprocessed twice.
+        """
+        if X is None:
+            X = self.preprocess_input(input_data)
+        
+        if hasattr(self.model, 'coef_'):
+            # Linear model: exact coefficient x scaled value contributions
+            contributions = np.ravel(self.model.coef_) * X[0]
+            baseline = float(np.ravel(self.model.intercept_)[0])
+        else:
+            forest = self._forest_arrays()
+            if forest is None:
+                return None
+            baseline, contributions = self._path_contributions(forest, X[0])
+        
+        contributions = pd.Series(contributions, index=self.feature_names)
+        order = contributions.abs().sort_values(ascending=False).index
+        return {
+            'baseline': baseline,
+            'contributions': contributions[order].head(top_n)
+        }
+    
+    def _forest_arrays(self):
+        """Flat node table of the forest, built once and cached"""
+        if not is_forest(self.model):
+            return None
+        if getattr(self, '_flat_forest', None) is None:
+            self._flat_forest = flatten_forest(self.model)
+        return self._flat_forest
+    
+    def _path_contributions(self, forest, x):
+        """Walk every tree at once, crediting each split's change in node value to its feature"""
+        x = np.asarray(x, dtype=np.float32)
+        node = np.asarray(forest['roots'])
+        n_trees = len(node)
+        contributions = np.zeros(len(x))
+        baseline = float(np.mean(forest['value'][node]))
+        
+        for _ in range(forest['max_depth']):
+            left = forest['children_left'][node]
+            active = left != -1
+            if not active.any():
+                break
+            node, left = node[active], left[active]
+            feature = forest['feature'][node]
+            value = x[feature]
+            go_left = (value <= forest['threshold'][node]) | (np.isnan(value) & forest['missing_go_to_left'][node])
+            child = np.where(go_left, left, forest['children_right'][node])
+            np.add.at(contributions, feature, forest['value'][child] - forest['value'][node])
+            # Trees that reached a leaf drop out; their contributions are complete
+            node = child
+        
+        return baseline, contributions / n_trees
+    
+    def _n_trees(self):
+        """Number of trees in the forest, or None for non-forest models"""
+        if not is_forest(self.model):
+            return None
+        return len(self.model.estimators_)
+    
+    def _tree_predictions(self, X, trees=slice(None)):
+        """Per-tree predictions of shape (n_samples, n_trees), or None for non-forest models"""
+        if not is_forest(self.model):
+            return None
+        return np.stack([tree.predict(X) for tree in self.model.estimators_[trees]], axis=1)
+    
+    def _observe_inputs(self, input_data):
+        """Record raw inputs before preprocessing fills or encodes them"""
+        if self.drift_monitor is not None:
+            self.drift_monitor.observe_inputs(input_data)
+    
+    def _observe_predictions(self, predictions):
+        if self.drift_monitor is not None:
+            self.drift_monitor.observe_predictions(predictions)
+    
+    def _lookup(self, input_data):
+        """Cached result for a single record identical to a scored row, if any"""
+        if self.score_table is None or not isinstance(input_data, dict) or 'Id' not in input_data:
+            return None
+        return self.score_table.lookup(input_data['Id'], input_data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+"""
+Score Table Module
+Scores a whole file once and stores the results in a memory-mapped table
+addressed directly by property Id (or by binary search over sorted Ids when
+the Ids are sparse), so repeat lookups are a cheap read
+"""
+
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+import joblib
+
+
+COLUMNS = ['prediction', 'lower_bound', 'upper_bound']
+
+# Ids are addressed directly while their span is at most this many times the row count
+MAX_DENSE_SPAN = 4
+
+
+def record_hash(record, columns):
+    """64-bit hash of a record's raw fields, treating missing keys, None and NaN alike"""
+    values = []
+    for col in columns:
+        value = record.get(col)
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            values.append(None)
+        elif isinstance(value, (int, float, np.number)):
+            values.append(float(value))
+        else:
+            values.append(str(value))
+    return int.from_bytes(hashlib.sha256(repr(values).encode()).digest()[:8], 'little', signed=True)
+
+
+def model_bundle_version(model_path='models/best_model.pkl', artifacts_dir='models'):
+    """Hash of the model and preprocessing artifacts that produced a prediction"""
+    digest = hashlib.sha256()
+    paths = [model_path] + [
+        os.path.join(artifacts_dir, name)
+        for name in ['scaler.pkl', 'label_encoders.pkl', 'feature_names.pkl']
+    ]
+    # Older bundles have no fill values
+    if os.path.exists(os.path.join(artifacts_dir, 'fill_values.pkl')):
+        paths.append(os.path.join(artifacts_dir, 'fill_values.pkl'))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class ScoreTable:
+    """Memory-mapped Id -> prediction and interval table"""
+
+    def __init__(self, table_dir='models/score_table'):
+        """Open an existing table read-only"""
+        self.table_dir = table_dir
+        self.meta = joblib.load(os.path.join(table_dir, 'meta.pkl'))
+        self.min_id = self.meta['min_id']
+        # Dense: one row per Id in [min_id, max_id]. Sorted: one row per scored Id, in Id order
+        self.layout = self.meta.get('layout', 'dense')
+        self.ids = np.load(os.path.join(table_dir, 'ids.npy'), mmap_mode='r') if self.layout == 'sorted' else None
+        self.values = np.load(os.path.join(table_dir, 'values.npy'), mmap_mode='r')
+        self.record_hashes = np.load(os.path.join(table_dir, 'record_hashes.npy'), mmap_mode='r')
+
+    def lookup(self, house_id, record=None):
+        """Cached result for house_id, or None if the table does not cover it
+
+        When record is given, the result is only returned if its fields match the
+        row that was scored, so a known Id sent with changed fields is recomputed.
+        """
+        position = self._position(int(house_id))
+        if position is None:
+            return None
+        if record is not None and record_hash(record, self.meta['columns']) != self.record_hashes[position]:
+            return None
+
+        prediction, lower_bound, upper_bound = self.values[position]
+        if np.isnan(prediction):
+            return None
+        if np.isnan(lower_bound):
+            return {'prediction': prediction, 'lower_bound': None, 'upper_bound': None}
+        return {
+            'prediction': prediction,
+            'lower_bound': lower_bound,
+            'upper_bound': upper_bound,
+            'confidence_interval': (lower_bound, upper_bound)
+        }
+
+    def _position(self, house_id):
+        """Row of house_id in the table, or None"""
+        if self.layout == 'sorted':
+            position = int(np.searchsorted(self.ids, house_id))
+            return position if position < len(self.ids) and self.ids[position] == house_id else None
+        position = house_id - self.min_id
+        return position if 0 <= position < len(self.values) else None
+
+    @staticmethod
+    def build(predictor, source_path='test.csv', table_dir='models/score_table', chunk_size=50_000):
+        """Batch-score source_path with predictor and write the table"""
+        print(f"Building score table from '{source_path}'...")
+        os.makedirs(table_dir, exist_ok=True)
+
+        scored, hashes = [], []
+        for chunk in pd.read_csv(source_path, chunksize=chunk_size):
+            columns = chunk.columns.tolist()
+            scored.append(predictor.predict_batch(chunk))
+            # Fingerprints of the raw rows that were scored, keyed like the predictions
+            by_id = {record['Id']: record_hash(record, columns) for record in chunk.to_dict('records')}
+            hashes.extend(by_id[house_id] for house_id in scored[-1]['Id'])
+        scored = pd.concat(scored)
+        ids = scored['Id'].astype(np.int64).values
+        hashes = np.asarray(hashes, dtype=np.int64)
+        # A source whose rows were all quarantined gives an empty table
+        min_id = int(ids.min()) if len(ids) else 0
+        span = int(ids.max()) - min_id + 1 if len(ids) else 0
+
+        arrays = {}
+        if span <= MAX_DENSE_SPAN * max(len(ids), 1):
+            # One slot per Id in [min_id, max_id]; Ids that were not scored hold NaN
+            layout = 'dense'
+            arrays['values'] = np.full((span, len(COLUMNS)), np.nan)
+            arrays['values'][ids - min_id] = scored[COLUMNS].values
+            arrays['record_hashes'] = np.zeros(span, dtype=np.int64)
+            arrays['record_hashes'][ids - min_id] = hashes
+        else:
+            # Sparse Ids (e.g. a portfolio export) would make the dense table huge, so keep sorted rows
+            layout = 'sorted'
+            order = np.argsort(ids, kind='stable')
+            arrays['ids'] = ids[order]
+            arrays['values'] = scored[COLUMNS].values[order]
+            arrays['record_hashes'] = hashes[order]
+        meta = {
+            'version': predictor.version,
+            'source_path': source_path,
+            'layout': layout,
+            'min_id': min_id,
+            'n_rows': len(ids),
+            'columns': columns,
+            # Missing values were filled from training statistics, as on the single-record path
+            'fill_policy': 'training' if predictor.fill_values is not None else 'scaler_mean'
+        }
+
+        # Write then rename, so processes still mapping the old table keep a valid file
+        for name, array in arrays.items():
+            np.save(os.path.join(table_dir, f'{name}.tmp.npy'), array)
+        joblib.dump(meta, os.path.join(table_dir, 'meta.tmp.pkl'))
+        for name in [f'{name}.npy' for name in arrays] + ['meta.pkl']:
+            stem, ext = os.path.splitext(name)
+            os.replace(os.path.join(table_dir, f'{stem}.tmp{ext}'), os.path.join(table_dir, name))
+
+        print(f"✅ Score table ({layout}) with {len(ids):,} rows written to '{table_dir}'")
+        return ScoreTable(table_dir)
+
+    @staticmethod
+    def attach(predictor, table_dir='models/score_table'):
+        """Open the table for predictor, rebuilding it if the model bundle has changed"""
+        if not os.path.exists(os.path.join(table_dir, 'meta.pkl')):
+            return None
+
+        meta = joblib.load(os.path.join(table_dir, 'meta.pkl'))
+        # Tables from before record fingerprints were added are rebuilt as well
+        if meta['version'] != predictor.version or 'columns' not in meta:
+            print("Model bundle changed, rebuilding score table...")
+            return ScoreTable.build(predictor, meta['source_path'], table_dir)
+        return ScoreTable(table_dir)
+
+
+if __name__ == "__main__":
+    # Example usage
+    from predict import HousePricePredictor
+
+    predictor = HousePricePredictor(score_table_dir='models/score_table')
+    if predictor.score_table is None:
+        predictor.score_table = ScoreTable.build(predictor, 'test.csv')
+
+    print(predictor.score_table.lookup(1461))
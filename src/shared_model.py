@@ -0,0 +1,238 @@
+"""
+Shared Model Serving Module
+Exports the trained model as flat memory-mapped arrays so that many worker
+processes on one host can serve predictions from a single copy in memory;
+other models are dumped with joblib and memory-mapped on load, with any
+scikit-learn trees inside them (stacked members, boosting stages, partition
+models) swapped for flat node tables that can be mapped too
+"""
+
+import os
+import warnings
+import numpy as np
+import joblib
+from sklearn.linear_model import Ridge, LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.dummy import DummyRegressor
+from sklearn.ensemble import GradientBoostingRegressor
+from predict import HousePricePredictor, flatten_forest, flatten_trees, is_forest
+
+
+def walk_trees(arrays, max_depth, X, trees=slice(None)):
+    """Leaf values of shape (n_samples, n_trees) from a flat node table, walking all trees at once"""
+    # Trees compare float32 features, as scikit-learn does at predict time
+    X = np.asarray(X, dtype=np.float32)
+    roots = np.asarray(arrays['roots'][trees])
+    node = np.tile(roots, (X.shape[0], 1))
+    rows = np.arange(X.shape[0])[:, None]
+
+    for _ in range(max_depth):
+        left = arrays['children_left'][node]
+        leaf = left == -1
+        if leaf.all():
+            break
+        feature = np.where(leaf, 0, arrays['feature'][node])
+        x = X[rows, feature]
+        # NaN inputs follow the branch the tree learned for missing values
+        go_left = (x <= arrays['threshold'][node]) | (np.isnan(x) & arrays['missing_go_to_left'][node])
+        node = np.where(leaf, node, np.where(go_left, left, arrays['children_right'][node]))
+
+    return np.asarray(arrays['value'][node])
+
+
+class FlatTrees:
+    """Fitted forest, single tree or boosted ensemble held as a flat node table
+
+    scikit-learn trees copy their nodes into private buffers when unpickled, so they
+    cannot stay memory-mapped; plain arrays in this layout can.
+    """
+
+    def __init__(self, model):
+        if isinstance(model, GradientBoostingRegressor):
+            # Boosting adds the scaled stage outputs to the initial estimate
+            estimators = model.estimators_[:, 0]
+            self.offset = 0.0 if model.init_ == 'zero' else float(np.ravel(model.init_.constant_)[0])
+            self.scale = model.learning_rate
+            self.average = False
+        else:
+            estimators = [model] if isinstance(model, DecisionTreeRegressor) else model.estimators_
+            self.offset, self.scale, self.average = 0.0, 1.0, True
+        self.arrays = flatten_trees(estimators)
+        self.max_depth = self.arrays.pop('max_depth')
+
+    def predict(self, X):
+        values = walk_trees(self.arrays, self.max_depth, X)
+        return self.offset + self.scale * (values.mean(axis=1) if self.average else values.sum(axis=1))
+
+
+def flatten_tree_members(obj, replaced=None):
+    """obj with every fitted scikit-learn tree model in it, at any depth, replaced by FlatTrees"""
+    # Keyed by id, so a model referenced twice (e.g. base_models and base_models_) is flattened once
+    replaced = {} if replaced is None else replaced
+    if id(obj) in replaced:
+        return replaced[id(obj)]
+
+    if isinstance(obj, GradientBoostingRegressor) and hasattr(obj, 'estimators_'):
+        if obj.init_ == 'zero' or isinstance(obj.init_, DummyRegressor):
+            replaced[id(obj)] = FlatTrees(obj)
+        else:
+            warnings.warn("Gradient boosting with a custom init is exported as is; "
+                          "its trees are copied into every worker")
+            replaced[id(obj)] = obj
+    elif (is_forest(obj) and hasattr(obj, 'estimators_')) or (isinstance(obj, DecisionTreeRegressor)
+                                                              and hasattr(obj, 'tree_')):
+        replaced[id(obj)] = FlatTrees(obj)
+    elif isinstance(obj, dict):
+        replaced[id(obj)] = {key: flatten_tree_members(value, replaced) for key, value in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        replaced[id(obj)] = type(obj)(flatten_tree_members(value, replaced) for value in obj)
+    elif hasattr(obj, '__dict__') and not isinstance(obj, type):
+        # Estimators, pipelines and routers: swap members in place
+        replaced[id(obj)] = obj
+        for name, value in list(vars(obj).items()):
+            setattr(obj, name, flatten_tree_members(value, replaced))
+    else:
+        replaced[id(obj)] = obj
+    return replaced[id(obj)]
+
+
+class SharedModel:
+    """Read-only model backed by memory-mapped arrays"""
+
+    # Arrays written for tree ensembles and linear models respectively
+    FOREST_ARRAYS = ['roots', 'children_left', 'children_right', 'feature', 'threshold',
+                     'missing_go_to_left', 'value']
+    LINEAR_ARRAYS = ['coef', 'intercept']
+
+    def __init__(self, bundle_dir='models/shared'):
+        """Attach to an exported bundle without copying its arrays"""
+        self.meta = joblib.load(os.path.join(bundle_dir, 'meta.pkl'))
+        self.kind = self.meta['kind']
+
+        if self.kind == 'estimator':
+            # The numpy arrays inside the pickle are mapped read-only rather than copied
+            self.estimator = joblib.load(os.path.join(bundle_dir, 'model.pkl'), mmap_mode='r')
+            return
+
+        names = self.FOREST_ARRAYS if self.kind == 'forest' else self.LINEAR_ARRAYS
+        for name in names:
+            # mmap_mode='r' maps the file read-only; pages are shared through the OS page cache
+            setattr(self, name, np.load(os.path.join(bundle_dir, f'{name}.npy'), mmap_mode='r'))
+
+        if self.kind == 'forest':
+            self.n_trees = len(self.roots)
+            self.max_depth = self.meta['max_depth']
+        else:
+            # scikit-learn names, so linear explanations work unchanged
+            self.coef_, self.intercept_ = self.coef, self.intercept
+
+    def predict_trees(self, X, trees=slice(None)):
+        """Per-tree predictions of shape (n_samples, n_trees), walking all trees at once"""
+        arrays = {name: getattr(self, name) for name in self.FOREST_ARRAYS}
+        return walk_trees(arrays, self.max_depth, X, trees)
+
+    def predict(self, X):
+        """Predict in the same way as the exported scikit-learn model"""
+        if self.kind == 'estimator':
+            return self.estimator.predict(X)
+        if self.kind == 'forest':
+            return self.predict_trees(X).mean(axis=1)
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept[0]
+
+
+def export_shared_bundle(model_path='models/best_model.pkl', bundle_dir='models/shared', artifacts_dir='models'):
+    """Load the artifacts once and write them as memory-mappable arrays"""
+    print("Exporting shared model bundle...")
+    model = joblib.load(model_path)
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    if is_forest(model):
+        arrays = flatten_forest(model)
+        meta = {'kind': 'forest', 'max_depth': arrays.pop('max_depth')}
+    elif isinstance(model, (Ridge, LinearRegression)):
+        arrays = {
+            'coef': np.asarray(model.coef_, dtype=np.float64).ravel(),
+            'intercept': np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64)),
+        }
+        meta = {'kind': 'linear'}
+    else:
+        # Pipelines, stacked, boosted and partitioned models keep their own predict; their trees
+        # become flat node tables, and joblib stores every array so workers can map it
+        arrays = {}
+        joblib.dump(flatten_tree_members(model), os.path.join(bundle_dir, 'model.pkl'))
+        meta = {'kind': 'estimator'}
+
+    for name, array in arrays.items():
+        np.save(os.path.join(bundle_dir, f'{name}.npy'), array)
+
+    # Small preprocessing artifacts travel with the bundle so workers need nothing else
+    meta['scaler'] = joblib.load(os.path.join(artifacts_dir, 'scaler.pkl'))
+    meta['label_encoders'] = joblib.load(os.path.join(artifacts_dir, 'label_encoders.pkl'))
+    meta['feature_names'] = joblib.load(os.path.join(artifacts_dir, 'feature_names.pkl'))
+    fill_values_path = os.path.join(artifacts_dir, 'fill_values.pkl')
+    meta['fill_values'] = joblib.load(fill_values_path) if os.path.exists(fill_values_path) else None
+    joblib.dump(meta, os.path.join(bundle_dir, 'meta.pkl'))
+
+    print(f"✅ Shared bundle ({meta['kind']}) written to '{bundle_dir}'")
+    return bundle_dir
+
+
+class SharedHousePricePredictor(HousePricePredictor):
+    """Predictor for worker processes that attaches to a shared bundle"""
+
+    def __init__(self, bundle_dir='models/shared'):
+        """Attach to memory-mapped arrays instead of unpickling the model"""
+        shared = SharedModel(bundle_dir)
+        # Estimator bundles serve the mapped estimator itself through the inherited methods
+        self.model = shared.estimator if shared.kind == 'estimator' else shared
+        self.scaler = shared.meta['scaler']
+        self.label_encoders = shared.meta['label_encoders']
+        self.feature_names = shared.meta['feature_names']
+        self.fill_values = shared.meta.get('fill_values')
+
+    def _shared_forest(self):
+        return isinstance(self.model, SharedModel) and self.model.kind == 'forest'
+
+    def _forest_arrays(self):
+        """Memory-mapped node table, in the layout flatten_forest produces"""
+        if not self._shared_forest():
+            return super()._forest_arrays()
+        arrays = {name: getattr(self.model, name) for name in SharedModel.FOREST_ARRAYS}
+        arrays['max_depth'] = self.model.max_depth
+        return arrays
+
+    def _n_trees(self):
+        return self.model.n_trees if self._shared_forest() else super()._n_trees()
+
+    def _tree_predictions(self, X, trees=slice(None)):
+        """Per-tree predictions from the shared node table"""
+        if not self._shared_forest():
+            return super()._tree_predictions(X, trees)
+        return self.model.predict_trees(X, trees)
+
+    def predict_with_confidence(self, input_data, return_features=False):
+        """Make prediction with confidence interval from the shared trees"""
+        if not self._shared_forest():
+            return super().predict_with_confidence(input_data, return_features)
+
+        X = self.preprocess_input(input_data)
+        tree_predictions = self.model.predict_trees(X)[0]
+        prediction = tree_predictions.mean()
+        std = np.std(tree_predictions)
+        lower_bound = prediction - 1.96 * std
+        upper_bound = prediction + 1.96 * std
+
+        result = {
+            'prediction': prediction,
+            'lower_bound': max(0, lower_bound),
+            'upper_bound': upper_bound,
+            'confidence_interval': (lower_bound, upper_bound)
+        }
+        if return_features:
+            result['features'] = X
+        return result
+
+
+if __name__ == "__main__":
+    # Run once in the parent process; workers then use SharedHousePricePredictor()
+    export_shared_bundle()
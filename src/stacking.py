@@ -0,0 +1,86 @@
+"""
+Stacking Module
+Keeps the held-out fold predictions GridSearchCV computes while scoring
+candidates, and stacks the tuned models with a linear meta-learner fit on
+them, so stacking needs no extra base-model fits
+"""
+
+import os
+import glob
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import joblib
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import cross_val_predict
+
+
+class OutOfFoldRecorder:
+    """GridSearchCV scorer (negative MSE) that also saves every candidate's fold predictions"""
+
+    def __init__(self, param_names):
+        self.param_names = list(param_names)
+        # Scorers run in the search's worker processes, so predictions go through disk
+        self.output_dir = tempfile.mkdtemp(prefix='oof_')
+
+    def __call__(self, estimator, X, y):
+        predictions = estimator.predict(X)
+        if hasattr(X, 'index'):
+            key = self._key(estimator.get_params())
+            fold = joblib.hash(np.asarray(X.index))
+            np.save(os.path.join(self.output_dir, f'{key}_{fold}.npy'),
+                    np.column_stack([np.asarray(X.index), predictions]))
+        return -mean_squared_error(y, predictions)
+
+    def collect(self, best_params, index):
+        """Out-of-fold predictions of the best candidate, aligned to index; removes the saved folds"""
+        oof = pd.Series(np.nan, index=index)
+        for path in glob.glob(os.path.join(self.output_dir, f'{self._key(best_params)}_*.npy')):
+            fold = np.load(path)
+            oof.loc[fold[:, 0].astype(index.dtype)] = fold[:, 1]
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+        return oof.values
+
+    def _key(self, params):
+        return joblib.hash({name: params[name] for name in self.param_names})
+
+
+class StackedModel(BaseEstimator, RegressorMixin):
+    """Linear meta-learner over the predictions of several base models"""
+
+    def __init__(self, base_models, meta_model=None, cv=5):
+        self.base_models = base_models
+        self.meta_model = meta_model
+        self.cv = cv
+
+    def fit(self, X, y):
+        """Full stacking fit: cross-validated base predictions, then base and meta fits"""
+        oof = np.column_stack([
+            cross_val_predict(clone(model), X, y, cv=self.cv) for model in self.base_models.values()
+        ])
+        self.base_models_ = {name: clone(model).fit(X, y) for name, model in self.base_models.items()}
+        return self._fit_meta(oof, y)
+
+    def fit_from_oof(self, oof, y):
+        """Fit only the meta-learner, reusing already fitted base models and their fold predictions"""
+        self.base_models_ = dict(self.base_models)
+        return self._fit_meta(oof, y)
+
+    def predict(self, X):
+        return self.meta_model_.predict(self.base_predictions(X))
+
+    def base_predictions(self, X):
+        return np.column_stack([model.predict(X) for model in self.base_models_.values()])
+
+    @property
+    def weights(self):
+        return dict(zip(self.base_models_, self.meta_model_.coef_))
+
+    def _fit_meta(self, oof, y):
+        # Non-negative weights keep the blend interpretable and stop correlated models cancelling out
+        meta_model = self.meta_model if self.meta_model is not None else LinearRegression(positive=True)
+        self.meta_model_ = clone(meta_model).fit(oof, y)
+        return self
@@ -0,0 +1,86 @@
+"""
+Synthetic Data Module
+Generates larger datasets with the same schema as train.csv by resampling
+the real rows and perturbing them with noise
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+
+class SyntheticDataGenerator:
+    """Resample train.csv with noise to produce datasets of any size"""
+
+    def __init__(self, source_path='train.csv', noise=0.05, category_swap=0.02, random_state=42):
+        """Fit per-column statistics from the source data"""
+        self.source = pd.read_csv(source_path)
+        self.noise = noise
+        self.category_swap = category_swap
+        self.rng = np.random.default_rng(random_state)
+
+        numeric = self.source.select_dtypes(include=[np.number]).drop(columns=['Id'], errors='ignore')
+        self.numeric_cols = numeric.columns.tolist()
+        self.numeric_std = numeric.std().fillna(0).values
+        self.numeric_min = numeric.min().values
+        self.numeric_max = numeric.max().values
+        # Columns that only hold whole numbers are rounded back after adding noise
+        self.integer_cols = [
+            col for col in self.numeric_cols
+            if (self.source[col].dropna() % 1 == 0).all()
+        ]
+
+        # Empirical category frequencies (missing kept as its own level)
+        self.categorical_cols = self.source.select_dtypes(include=['object']).columns.tolist()
+        self.category_freqs = {
+            col: self.source[col].value_counts(normalize=True, dropna=False)
+            for col in self.categorical_cols
+        }
+
+    def sample(self, n_rows, start_id=1):
+        """Draw n_rows synthetic records"""
+        idx = self.rng.integers(0, len(self.source), size=n_rows)
+        df = self.source.iloc[idx].reset_index(drop=True)
+
+        # Numeric columns: gaussian noise scaled by column std, clipped to the observed range
+        values = df[self.numeric_cols].values.astype(float)
+        values += self.rng.normal(0, 1, values.shape) * self.numeric_std * self.noise
+        values = np.clip(values, self.numeric_min, self.numeric_max)
+        df[self.numeric_cols] = values
+        df[self.integer_cols] = df[self.integer_cols].round().astype('Int64')
+
+        # Categorical columns: swap a small share of values for a draw from the marginal
+        for col in self.categorical_cols:
+            swap = self.rng.random(n_rows) < self.category_swap
+            if swap.any():
+                freqs = self.category_freqs[col]
+                df.loc[swap, col] = self.rng.choice(freqs.index.values, size=swap.sum(), p=freqs.values)
+
+        if 'Id' in df.columns:
+            df['Id'] = np.arange(start_id, start_id + n_rows)
+
+        return df[self.source.columns]
+
+    def write(self, n_rows, output_path, chunk_size=100_000):
+        """Write n_rows synthetic records to CSV in chunks to bound memory"""
+        print(f"Generating {n_rows:,} synthetic rows -> {output_path}")
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+        written = 0
+        while written < n_rows:
+            size = min(chunk_size, n_rows - written)
+            chunk = self.sample(size, start_id=written + 1)
+            chunk.to_csv(output_path, mode='w' if written == 0 else 'a',
+                         header=written == 0, index=False)
+            written += size
+
+        return output_path
+
+
+if __name__ == "__main__":
+    # Example usage
+    generator = SyntheticDataGenerator()
+    for n_rows in [10_000, 100_000, 1_000_000, 10_000_000]:
+        generator.write(n_rows, f'data/synthetic/train_{n_rows}.csv')
+
+    print("\n✅ Synthetic datasets generated successfully!")
@@ -1,19 +1,36 @@
 """
 Model Training Module
-Trains Ridge Regression and Random Forest models and compares their performance
+Trains Ridge Regression, Random Forest and Gradient Boosting models, stacks them and compares their performance
 """
 
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import Ridge
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import GridSearchCV, cross_val_score
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor, GradientBoostingRegressor
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.model_selection import GridSearchCV, KFold, cross_val_score
+from sklearn.inspection import permutation_importance
+from scipy.optimize import minimize
+from sklearn.base import clone
+import copy
+import os
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
-from data_preprocessing import HousePricePreprocessor
+from data_preprocessing import HousePricePreprocessor, CategoryCodeRestorer
+from drift_monitor import DriftMonitor
+from stacking import OutOfFoldRecorder, StackedModel
+from one_hot_ridge import OneHotRidge
 import time
+import io
+import tracemalloc
+
+
+# Serving SLOs used when selecting the best model (None disables a limit)
+LATENCY_SLO_MS = 50
+MEMORY_SLO_MB = 500
 
 
 class ModelTrainer:
@@ -24,6 +41,13 @@ class ModelTrainer:
         self.results = {}
         self.best_model = None
         self.best_model_name = None
+        self.selected_features = None
+        self.pruned_model = None
+        self.selection_report = None
+        self.distilled_model = None
+        self.distillation_report = None
+        self.ensemble_weights = None
+        self.oof_predictions = {}
         
     def train_ridge_regression(self, X_train, y_train, X_val, y_val):
         """Train Ridge Regression with hyperparameter tuning"""
@@ -36,9 +60,10 @@ class ModelTrainer:
         
         # Grid search with cross-validation
         ridge = Ridge(random_state=42)
+        recorder = OutOfFoldRecorder(param_grid)
         grid_search = GridSearchCV(
             ridge, param_grid, cv=5, 
-            scoring='neg_mean_squared_error',
+            scoring=recorder,  # negative MSE; also keeps fold predictions for stacking
             n_jobs=-1, verbose=1
         )
         
@@ -62,6 +87,7 @@ class ModelTrainer:
         
         self.models['Ridge Regression'] = best_ridge
         self.results['Ridge Regression'] = results
+        self.oof_predictions['Ridge Regression'] = recorder.collect(grid_search.best_params_, X_train.index)
         
         return best_ridge, results
     
@@ -79,9 +105,10 @@ class ModelTrainer:
         
         # Grid search with cross-validation
         rf = RandomForestRegressor(random_state=42, n_jobs=-1)
+        recorder = OutOfFoldRecorder(param_grid)
         grid_search = GridSearchCV(
             rf, param_grid, cv=3,  # Using 3-fold CV to save time
-            scoring='neg_mean_squared_error',
+            scoring=recorder,  # negative MSE; also keeps fold predictions for stacking
             n_jobs=-1, verbose=1
         )
         
@@ -105,9 +132,157 @@ class ModelTrainer:
         
         self.models['Random Forest'] = best_rf
         self.results['Random Forest'] = results
+        self.oof_predictions['Random Forest'] = recorder.collect(grid_search.best_params_, X_train.index)
         
         return best_rf, results
     
+    def train_gradient_boosting(self, X_train, y_train, X_val, y_val, categorical_features=None, scaler=None):
+        """Train Histogram Gradient Boosting with native categorical support"""
+        print("\n=== TRAINING GRADIENT BOOSTING ===")
+        
+        # Label-encoded columns are restored to integer codes and split on natively
+        categorical_features = categorical_features or []
+        categorical_indices = [X_train.columns.get_loc(col) for col in categorical_features]
+        categorical_mask = np.isin(np.arange(X_train.shape[1]), categorical_indices)
+        
+        # Hyperparameter grid
+        param_grid = {
+            'hgb__learning_rate': [0.05, 0.1],
+            'hgb__max_leaf_nodes': [15, 31]
+        }
+        
+        # Early stopping on an internal validation split; histogram building is multithreaded
+        hgb = HistGradientBoostingRegressor(
+            max_iter=1000, early_stopping=True, validation_fraction=0.1,
+            n_iter_no_change=20, categorical_features=categorical_mask,
+            random_state=42
+        )
+        steps = [('hgb', hgb)]
+        if categorical_indices:
+            restorer = CategoryCodeRestorer(
+                categorical_indices, scaler.mean_[categorical_indices], scaler.scale_[categorical_indices]
+            )
+            steps.insert(0, ('codes', restorer))
+        
+        # Candidates run one at a time so each fit gets all cores for its histograms
+        recorder = OutOfFoldRecorder(param_grid)
+        grid_search = GridSearchCV(
+            Pipeline(steps), param_grid, cv=3,
+            scoring=recorder,  # negative MSE; also keeps fold predictions for stacking
+            n_jobs=1, verbose=1
+        )
+        
+        start_time = time.time()
+        grid_search.fit(X_train, y_train)
+        training_time = time.time() - start_time
+        
+        # Best model
+        best_hgb = grid_search.best_estimator_
+        print(f"Best parameters: {grid_search.best_params_}")
+        print(f"Boosting iterations: {best_hgb.named_steps['hgb'].n_iter_}")
+        print(f"Training time: {training_time:.2f} seconds")
+        
+        # Predictions
+        y_pred_train = best_hgb.predict(X_train)
+        y_pred_val = best_hgb.predict(X_val)
+        
+        # Evaluate
+        results = self.evaluate_model(y_train, y_pred_train, y_val, y_pred_val, "Gradient Boosting")
+        results['training_time'] = training_time
+        results['best_params'] = grid_search.best_params_
+        
+        self.models['Gradient Boosting'] = best_hgb
+        self.results['Gradient Boosting'] = results
+        self.oof_predictions['Gradient Boosting'] = recorder.collect(grid_search.best_params_, X_train.index)
+        
+        return best_hgb, results
+    
+    def train_sparse_ridge(self, X_train, y_train, X_val, y_val, categorical_features=None, scaler=None):
+        """Train Ridge Regression on a sparse one-hot design matrix"""
+        print("\n=== TRAINING SPARSE RIDGE (ONE-HOT) ===")
+        
+        # Label-encoded columns become a sparse one-hot block; numeric columns stay dense
+        categorical_features = categorical_features or []
+        categorical_indices = [X_train.columns.get_loc(col) for col in categorical_features]
+        restorer = CategoryCodeRestorer(
+            categorical_indices, scaler.mean_[categorical_indices], scaler.scale_[categorical_indices]
+        )
+        pipeline = Pipeline([
+            ('codes', restorer),
+            ('ridge', OneHotRidge(categorical_indices))
+        ])
+        
+        # Hyperparameter grid
+        param_grid = {
+            'ridge__alpha': [0.001, 0.01, 0.1, 1, 10, 100, 1000]
+        }
+        
+        # Grid search with cross-validation
+        recorder = OutOfFoldRecorder(param_grid)
+        grid_search = GridSearchCV(
+            pipeline, param_grid, cv=5,
+            scoring=recorder,  # negative MSE; also keeps fold predictions for stacking
+            n_jobs=-1, verbose=1
+        )
+        
+        start_time = time.time()
+        grid_search.fit(X_train, y_train)
+        training_time = time.time() - start_time
+        
+        # Best model
+        best_sparse = grid_search.best_estimator_
+        ridge = best_sparse.named_steps['ridge']
+        print(f"Best parameters: {grid_search.best_params_}")
+        print(f"Design matrix: {ridge.n_one_hot_} sparse one-hot columns "
+              f"({len(categorical_indices) / ridge.n_one_hot_:.1%} non-zero) + {len(ridge.numeric_indices_)} dense")
+        print(f"Training time: {training_time:.2f} seconds")
+        
+        # Predictions
+        y_pred_train = best_sparse.predict(X_train)
+        y_pred_val = best_sparse.predict(X_val)
+        
+        # Evaluate
+        results = self.evaluate_model(y_train, y_pred_train, y_val, y_pred_val, "Sparse Ridge")
+        results['training_time'] = training_time
+        results['best_params'] = grid_search.best_params_
+        
+        self.models['Sparse Ridge'] = best_sparse
+        self.results['Sparse Ridge'] = results
+        self.oof_predictions['Sparse Ridge'] = recorder.collect(grid_search.best_params_, X_train.index)
+        
+        return best_sparse, results
+    
+    def train_stacking(self, X_train, y_train, X_val, y_val):
+        """Stack the tuned models with a meta-learner fit on their grid-search fold predictions"""
+        print("\n=== TRAINING STACKED ENSEMBLE ===")
+        
+        # Only models whose every training row has a held-out prediction can be stacked
+        names = [name for name, oof in self.oof_predictions.items() if not np.isnan(oof).any()]
+        oof = np.column_stack([self.oof_predictions[name] for name in names])
+        
+        # Base models are the already refit best estimators; only the meta-learner is trained here
+        start_time = time.time()
+        stacked = StackedModel({name: self.models[name] for name in names}).fit_from_oof(oof, y_train)
+        training_time = time.time() - start_time
+        
+        for name, weight in stacked.weights.items():
+            print(f"{name}: {weight:.3f}")
+        print(f"Training time: {training_time:.2f} seconds")
+        
+        # Predictions
+        y_pred_train = stacked.predict(X_train)
+        y_pred_val = stacked.predict(X_val)
+        
+        # Evaluate
+        results = self.evaluate_model(y_train, y_pred_train, y_val, y_pred_val, "Stacked Ensemble")
+        results['training_time'] = training_time
+        results['stacking_weights'] = stacked.weights
+        
+        self.models['Stacked Ensemble'] = stacked
+        self.results['Stacked Ensemble'] = results
+        
+        return stacked, results
+    
     def evaluate_model(self, y_train, y_pred_train, y_val, y_pred_val, model_name):
         """Evaluate model performance"""
         print(f"\n--- {model_name} Performance ---")
@@ -138,8 +313,40 @@ class ModelTrainer:
             'val_r2': val_r2
         }
     
-    def compare_models(self):
-        """Compare all trained models"""
+    def measure_serving(self, X_val):
+        """Measure latency, throughput, size and load memory of every trained model"""
+        print("\n=== MEASURING SERVING CHARACTERISTICS ===")
+        X_val = np.asarray(X_val)
+        
+        for name, model in self.models.items():
+            latency = self.measure_latency(model, X_val)
+            
+            # Batch throughput on the whole validation split
+            start_time = time.perf_counter()
+            model.predict(X_val)
+            throughput = len(X_val) / (time.perf_counter() - start_time)
+            
+            # Serialized size, and peak memory allocated while loading it back
+            buffer = io.BytesIO()
+            joblib.dump(model, buffer)
+            size_mb = buffer.tell() / 1024 ** 2
+            buffer.seek(0)
+            tracemalloc.start()
+            joblib.load(buffer)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            self.results[name].update({
+                'p99_latency_ms': latency['p99_ms'],
+                'throughput_rps': throughput,
+                'size_mb': size_mb,
+                'memory_mb': peak / 1024 ** 2
+            })
+            print(f"{name}: p99 {latency['p99_ms']:.2f} ms, {throughput:,.0f} rows/s, "
+                  f"{size_mb:.2f} MB on disk, {peak / 1024 ** 2:.2f} MB loaded")
+    
+    def compare_models(self, max_latency_ms=None, max_memory_mb=None):
+        """Compare all trained models and pick the most accurate one within the serving SLOs"""
         print("\n=== MODEL COMPARISON ===")
         
         comparison_df = pd.DataFrame({
@@ -150,47 +357,138 @@ class ModelTrainer:
             'Training Time (s)': [self.results[m]['training_time'] for m in self.results]
         })
         
+        # Serving columns are present once measure_serving has run
+        serving_columns = {
+            'P99 Latency (ms)': 'p99_latency_ms',
+            'Throughput (rows/s)': 'throughput_rps',
+            'Size (MB)': 'size_mb',
+            'Memory (MB)': 'memory_mb'
+        }
+        if all('p99_latency_ms' in self.results[m] for m in self.results):
+            for column, key in serving_columns.items():
+                comparison_df[column] = [self.results[m][key] for m in self.results]
+        
         print("\n", comparison_df.to_string(index=False))
         
-        # Select best model (lowest validation RMSE)
-        best_idx = comparison_df['Validation RMSE'].idxmin()
+        # What stacking buys over its best base model, and what it costs per request
+        if 'Stacked Ensemble' in self.results:
+            stacked = self.results['Stacked Ensemble']
+            base_name = min(stacked['stacking_weights'], key=lambda m: self.results[m]['val_rmse'])
+            stacked['rmse_gain'] = self.results[base_name]['val_rmse'] - stacked['val_rmse']
+            message = f"\nStacking vs {base_name}: ${stacked['rmse_gain']:,.2f} lower validation RMSE"
+            if 'p99_latency_ms' in stacked:
+                stacked['extra_latency_ms'] = stacked['p99_latency_ms'] - self.results[base_name]['p99_latency_ms']
+                message += f", {stacked['extra_latency_ms']:+.2f} ms p99 latency"
+            print(message)
+        
+        # Select best model (lowest validation RMSE among models within the SLOs)
+        eligible = pd.Series(True, index=comparison_df.index)
+        if max_latency_ms is not None and 'P99 Latency (ms)' in comparison_df:
+            eligible &= comparison_df['P99 Latency (ms)'] <= max_latency_ms
+        if max_memory_mb is not None and 'Memory (MB)' in comparison_df:
+            eligible &= comparison_df['Memory (MB)'] <= max_memory_mb
+        if not eligible.any():
+            print("⚠️  No model meets the serving SLOs; falling back to the lowest RMSE")
+            eligible[:] = True
+        
+        best_idx = comparison_df.loc[eligible, 'Validation RMSE'].idxmin()
         self.best_model_name = comparison_df.loc[best_idx, 'Model']
         self.best_model = self.models[self.best_model_name]
+        for name in self.results:
+            self.results[name]['selected'] = name == self.best_model_name
         
         print(f"\n🏆 Best Model: {self.best_model_name}")
         print(f"   Validation RMSE: ${comparison_df.loc[best_idx, 'Validation RMSE']:,.2f}")
         
         return comparison_df
     
+    def fit_ensemble_weights(self, X_val, y_val):
+        """Fit non-negative weights summing to 1 for a weighted average of the base models on the validation split"""
+        print("\n=== ENSEMBLE WEIGHTS ===")
+        # The stacked ensemble already blends the base models, so it is not averaged with them again
+        names = [name for name, model in self.models.items() if not isinstance(model, StackedModel)]
+        predictions = np.column_stack([self.models[name].predict(X_val) for name in names])
+        y_val = np.asarray(y_val, dtype=float)
+        
+        weights = self._convex_weights(predictions, y_val)
+        self.ensemble_weights = dict(zip(names, weights))
+        
+        # The weights are fit on these rows, so also score weights fit on the other folds of the split
+        held_out = np.empty(len(y_val))
+        for fit_rows, score_rows in KFold(5, shuffle=True, random_state=42).split(predictions):
+            held_out[score_rows] = predictions[score_rows] @ self._convex_weights(predictions[fit_rows], y_val[fit_rows])
+        
+        for name, weight in self.ensemble_weights.items():
+            print(f"{name}: {weight:.3f}")
+        print(f"Ensemble validation RMSE: ${np.sqrt(mean_squared_error(y_val, predictions @ weights)):,.2f} (in-sample), "
+              f"${np.sqrt(mean_squared_error(y_val, held_out)):,.2f} (weights fit on other folds)")
+        
+        return self.ensemble_weights
+    
+    @staticmethod
+    def _convex_weights(predictions, y):
+        """Least-squares weights constrained to be non-negative and sum to 1"""
+        # Work in units of the target's spread so the solver's tolerances are meaningful
+        scale = y.std()
+        predictions, y = predictions / scale, y / scale
+        n_models = predictions.shape[1]
+        result = minimize(
+            lambda w: np.mean((predictions @ w - y) ** 2),
+            np.full(n_models, 1 / n_models),
+            jac=lambda w: 2 * predictions.T @ (predictions @ w - y) / len(y),
+            bounds=[(0, None)] * n_models,
+            constraints={'type': 'eq', 'fun': lambda w: w.sum() - 1},
+            method='SLSQP', options={'ftol': 1e-12}
+        )
+        return np.clip(result.x, 0, None)
+    
     def plot_comparison(self, comparison_df):
         """Create comparison visualizations"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        n_cols = 3 if 'P99 Latency (ms)' in comparison_df else 2
+        fig, axes = plt.subplots(2, n_cols, figsize=(7.5 * n_cols, 10))
         fig.suptitle('Model Comparison', fontsize=16, fontweight='bold')
         
+        # One colour per model, so models added after the first four keep their own
+        palette = ['#3498db', '#e74c3c', '#2ecc71', '#9b59b6', '#f39c12', '#1abc9c']
+        colors = [palette[i] if i < len(palette) else plt.cm.tab20(i % 20) for i in range(len(comparison_df))]
+        
         # RMSE comparison
-        axes[0, 0].bar(comparison_df['Model'], comparison_df['Validation RMSE'], color=['#3498db', '#e74c3c'])
+        axes[0, 0].bar(comparison_df['Model'], comparison_df['Validation RMSE'], color=colors)
         axes[0, 0].set_title('Validation RMSE (Lower is Better)')
         axes[0, 0].set_ylabel('RMSE ($)')
         axes[0, 0].tick_params(axis='x', rotation=45)
         
         # MAE comparison
-        axes[0, 1].bar(comparison_df['Model'], comparison_df['Validation MAE'], color=['#3498db', '#e74c3c'])
+        axes[0, 1].bar(comparison_df['Model'], comparison_df['Validation MAE'], color=colors)
         axes[0, 1].set_title('Validation MAE (Lower is Better)')
         axes[0, 1].set_ylabel('MAE ($)')
         axes[0, 1].tick_params(axis='x', rotation=45)
         
         # R² comparison
-        axes[1, 0].bar(comparison_df['Model'], comparison_df['Validation R²'], color=['#3498db', '#e74c3c'])
+        axes[1, 0].bar(comparison_df['Model'], comparison_df['Validation R²'], color=colors)
         axes[1, 0].set_title('Validation R² (Higher is Better)')
         axes[1, 0].set_ylabel('R² Score')
         axes[1, 0].tick_params(axis='x', rotation=45)
         
         # Training time comparison
-        axes[1, 1].bar(comparison_df['Model'], comparison_df['Training Time (s)'], color=['#3498db', '#e74c3c'])
+        axes[1, 1].bar(comparison_df['Model'], comparison_df['Training Time (s)'], color=colors)
         axes[1, 1].set_title('Training Time')
         axes[1, 1].set_ylabel('Time (seconds)')
         axes[1, 1].tick_params(axis='x', rotation=45)
         
+        if 'P99 Latency (ms)' in comparison_df:
+            # Serving latency comparison
+            axes[0, 2].bar(comparison_df['Model'], comparison_df['P99 Latency (ms)'], color=colors)
+            axes[0, 2].set_title('Single-Row P99 Latency (Lower is Better)')
+            axes[0, 2].set_ylabel('Latency (ms)')
+            axes[0, 2].tick_params(axis='x', rotation=45)
+            
+            # Serving memory comparison
+            axes[1, 2].bar(comparison_df['Model'], comparison_df['Memory (MB)'], color=colors)
+            axes[1, 2].set_title('Loaded Memory (Lower is Better)')
+            axes[1, 2].set_ylabel('Memory (MB)')
+            axes[1, 2].tick_params(axis='x', rotation=45)
+        
         plt.tight_layout()
         plt.savefig('models/model_comparison.png', dpi=300, bbox_inches='tight')
         print("\n📊 Comparison plot saved to 'models/model_comparison.png'")
@@ -209,7 +507,189 @@ class ModelTrainer:
         # Save results
         joblib.dump(self.results, 'models/training_results.pkl')
         
+        if self.ensemble_weights is not None:
+            joblib.dump(self.ensemble_weights, 'models/ensemble_weights.pkl')
+        
         print(f"\n🏆 Best model ({self.best_model_name}) saved as 'models/best_model.pkl'")
+    
+    def select_features(self, X_train, y_train, X_val, y_val, rmse_tolerance=0.01,
+                        method='permutation', subset_sizes=(5, 10, 15, 20, 30, 40, 60)):
+        """Retrain the best model on the smallest top-ranked feature subset within tolerance"""
+        print("\n=== FEATURE SELECTION ===")
+        
+        # Rank features by importance for the best model
+        if method == 'impurity' and hasattr(self.best_model, 'feature_importances_'):
+            importances = self.best_model.feature_importances_
+        else:
+            importances = permutation_importance(
+                self.best_model, X_val, y_val, n_repeats=5,
+                scoring='neg_mean_squared_error', random_state=42, n_jobs=-1
+            ).importances_mean
+        ranking = X_train.columns[np.argsort(importances)[::-1]].tolist()
+        
+        baseline_rmse = self.results[self.best_model_name]['val_rmse']
+        max_rmse = baseline_rmse * (1 + rmse_tolerance)
+        print(f"Baseline RMSE: ${baseline_rmse:,.2f} (tolerance: ${max_rmse:,.2f})")
+        
+        # Try subsets from smallest to largest and keep the first one within tolerance
+        sizes = [k for k in subset_sizes if k < len(ranking)] + [len(ranking)]
+        for k in sizes:
+            features = ranking[:k]
+            model = self._estimator_for_subset(X_train.columns, features)
+            model.fit(X_train[features], y_train)
+            val_rmse = np.sqrt(mean_squared_error(y_val, model.predict(X_val[features])))
+            print(f"Top {k} features: validation RMSE ${val_rmse:,.2f}")
+            if val_rmse <= max_rmse:
+                break
+        
+        self.selected_features = features
+        self.pruned_model = model
+        self.selection_report = {
+            'model': self.best_model_name,
+            'method': method,
+            'ranking': ranking,
+            'importances': dict(zip(X_train.columns, importances)),
+            'n_features': len(features),
+            'baseline_rmse': baseline_rmse,
+            'val_rmse': val_rmse,
+            'rmse_tolerance': rmse_tolerance
+        }
+        
+        print(f"\n✂️  Kept {len(features)} of {len(ranking)} features")
+        return features, self.selection_report
+    
+    def _estimator_for_subset(self, all_features, features, model=None):
+        """Unfitted copy of the best model configured for a column subset"""
+        model = clone(self.best_model if model is None else model)
+        if isinstance(model, StackedModel):
+            return model.set_params(base_models={
+                name: self._estimator_for_subset(all_features, features, base)
+                for name, base in model.base_models.items()
+            })
+        if not isinstance(model, Pipeline):
+            return model
+        
+        # Index-based column settings have to follow the kept columns
+        keep = [all_features.get_loc(col) for col in features]
+        params = {}
+        if 'codes' in model.named_steps:
+            codes = model.named_steps['codes']
+            old_positions = list(codes.categorical_indices)
+            kept = [old_positions.index(i) for i in old_positions if i in keep]
+            params['codes__categorical_indices'] = [keep.index(old_positions[j]) for j in kept]
+            params['codes__means'] = np.asarray(codes.means)[kept]
+            params['codes__scales'] = np.asarray(codes.scales)[kept]
+        if 'hgb' in model.named_steps:
+            mask = np.asarray(model.named_steps['hgb'].categorical_features)
+            params['hgb__categorical_features'] = mask[keep]
+        if isinstance(model.named_steps.get('ridge'), OneHotRidge):
+            columns = model.named_steps['ridge'].categorical_indices
+            params['ridge__categorical_indices'] = [keep.index(i) for i in columns if i in keep]
+        model.set_params(**params)
+        return model
+    
+    def save_pruned_model(self, scaler, label_encoders, output_dir='models/pruned', fill_values=None):
+        """Save the pruned model with a matching feature list, scaler and encoders"""
+        os.makedirs(output_dir, exist_ok=True)
+        keep = [list(scaler.feature_names_in_).index(col) for col in self.selected_features]
+        
+        # StandardScaler is per-column, so slicing its statistics equals refitting on the subset
+        pruned_scaler = copy.deepcopy(scaler)
+        pruned_scaler.mean_ = scaler.mean_[keep]
+        pruned_scaler.var_ = scaler.var_[keep]
+        pruned_scaler.scale_ = scaler.scale_[keep]
+        pruned_scaler.n_features_in_ = len(keep)
+        pruned_scaler.feature_names_in_ = np.asarray(self.selected_features, dtype=object)
+        
+        pruned_encoders = {col: le for col, le in label_encoders.items() if col in self.selected_features}
+        
+        joblib.dump(self.pruned_model, os.path.join(output_dir, 'best_model.pkl'))
+        joblib.dump(pruned_scaler, os.path.join(output_dir, 'scaler.pkl'))
+        joblib.dump(pruned_encoders, os.path.join(output_dir, 'label_encoders.pkl'))
+        joblib.dump(self.selected_features, os.path.join(output_dir, 'feature_names.pkl'))
+        if fill_values is not None:
+            joblib.dump(fill_values, os.path.join(output_dir, 'fill_values.pkl'))
+        joblib.dump(self.selection_report, os.path.join(output_dir, 'selection_report.pkl'))
+        
+        print(f"✅ Pruned model ({len(self.selected_features)} features) saved to '{output_dir}'")
+
+    
+    def measure_latency(self, model, X, n_runs=200):
+        """Single-row prediction latency in milliseconds"""
+        rows = np.asarray(X)[:n_runs]
+        timings = []
+        for i in range(len(rows)):
+            start_time = time.perf_counter()
+            model.predict(rows[i:i + 1])
+            timings.append((time.perf_counter() - start_time) * 1000)
+        return {'p50_ms': np.percentile(timings, 50), 'p99_ms': np.percentile(timings, 99)}
+    
+    def distill_random_forest(self, X_train, y_train, X_val, y_val, n_synthetic=20000,
+                              noise=0.1, student='boosting', speedup_target=10):
+        """Train a compact student on the forest's predictions for low-latency serving"""
+        print("\n=== DISTILLING RANDOM FOREST ===")
+        teacher = self.models['Random Forest']
+        
+        # Training rows plus noisy copies of them, all labelled by the teacher
+        rng = np.random.default_rng(42)
+        X_base = np.asarray(X_train)
+        idx = rng.integers(0, len(X_base), size=n_synthetic)
+        X_synthetic = X_base[idx] + rng.normal(0, noise, (n_synthetic, X_base.shape[1]))
+        X_distill = np.vstack([X_base, X_synthetic])
+        y_distill = teacher.predict(X_distill)
+        
+        if student == 'tree':
+            # Single piecewise-constant tree
+            model = DecisionTreeRegressor(max_depth=10, min_samples_leaf=5, random_state=42)
+        else:
+            # Shallow boosted ensemble; the classic implementation has no per-call binning or
+            # thread start-up, which kept the histogram variant only ~3x faster than the forest
+            model = GradientBoostingRegressor(
+                n_estimators=100, max_depth=3, learning_rate=0.1, subsample=0.8, random_state=42
+            )
+        
+        start_time = time.time()
+        model.fit(X_distill, y_distill)
+        training_time = time.time() - start_time
+        
+        # Fidelity against the teacher and accuracy against the true prices
+        X_val_array = np.asarray(X_val)
+        teacher_val = teacher.predict(X_val_array)
+        student_val = model.predict(X_val_array)
+        teacher_latency = self.measure_latency(teacher, X_val_array)
+        student_latency = self.measure_latency(model, X_val_array)
+        
+        report = {
+            'student': type(model).__name__,
+            'n_distill_rows': len(X_distill),
+            'training_time': training_time,
+            'fidelity_rmse': np.sqrt(mean_squared_error(teacher_val, student_val)),
+            'fidelity_r2': r2_score(teacher_val, student_val),
+            'teacher_val_rmse': np.sqrt(mean_squared_error(y_val, teacher_val)),
+            'student_val_rmse': np.sqrt(mean_squared_error(y_val, student_val)),
+            'teacher_p50_ms': teacher_latency['p50_ms'],
+            'student_p50_ms': student_latency['p50_ms'],
+            'speedup': teacher_latency['p50_ms'] / student_latency['p50_ms'],
+            'speedup_target': speedup_target
+        }
+        report['speedup_target_met'] = bool(report['speedup'] >= speedup_target)
+        
+        print(f"Fidelity to teacher: RMSE ${report['fidelity_rmse']:,.2f}, R² {report['fidelity_r2']:.4f}")
+        print(f"Validation RMSE: teacher ${report['teacher_val_rmse']:,.2f}, student ${report['student_val_rmse']:,.2f}")
+        print(f"Single-row latency: teacher {report['teacher_p50_ms']:.2f} ms, "
+              f"student {report['student_p50_ms']:.2f} ms ({report['speedup']:.0f}x faster)")
+        if not report['speedup_target_met']:
+            print(f"⚠️  Student misses the {speedup_target}x speedup target")
+        
+        self.distilled_model = model
+        self.distillation_report = report
+        return model, report
+    
+    def save_distilled_model(self):
+        """Save the distilled student as a separate serving tier"""
+        joblib.dump(self.distilled_model, 'models/distilled_model.pkl')
+        joblib.dump(self.distillation_report, 'models/distillation_report.pkl')
+        print("✅ Distilled model saved to 'models/distilled_model.pkl'")
 
 
 def main():
@@ -232,8 +712,28 @@ def main():
     # Train Random Forest
     trainer.train_random_forest(X_train, y_train, X_val, y_val)
     
+    # Train Ridge Regression on sparse one-hot categoricals
+    trainer.train_sparse_ridge(
+        X_train, y_train, X_val, y_val,
+        categorical_features=list(preprocessor.label_encoders),
+        scaler=preprocessor.scaler
+    )
+    
+    # Train Gradient Boosting
+    trainer.train_gradient_boosting(
+        X_train, y_train, X_val, y_val,
+        categorical_features=list(preprocessor.label_encoders),
+        scaler=preprocessor.scaler
+    )
+    
+    # Stack the tuned models on their grid-search fold predictions
+    trainer.train_stacking(X_train, y_train, X_val, y_val)
+    
     # Step 3: Compare models
-    comparison_df = trainer.compare_models()
+    trainer.measure_serving(X_val)
+    comparison_df = trainer.compare_models(max_latency_ms=LATENCY_SLO_MS, max_memory_mb=MEMORY_SLO_MB)
+    
+    trainer.fit_ensemble_weights(X_val, y_val)
     
     # Step 4: Visualize comparison
     trainer.plot_comparison(comparison_df)
@@ -241,6 +741,19 @@ def main():
     # Step 5: Save models
     trainer.save_models()
     
+    # Reference sketches of the training inputs and predictions for drift monitoring
+    predictions = trainer.best_model.predict(pd.concat([X_train, X_val]))
+    joblib.dump(DriftMonitor.build_reference(preprocessor.train_df, predictions), 'models/drift_reference.pkl')
+    
+    # Step 6: Prune features for a smaller serving model
+    trainer.select_features(X_train, y_train, X_val, y_val)
+    trainer.save_pruned_model(preprocessor.scaler, preprocessor.label_encoders,
+                              fill_values=preprocessor.profile['fill_values'])
+    
+    # Step 7: Distill the forest into a low-latency serving tier
+    trainer.distill_random_forest(X_train, y_train, X_val, y_val)
+    trainer.save_distilled_model()
+    
     print("\n" + "=" * 60)
     print("✅ TRAINING COMPLETED SUCCESSFULLY!")
     print("=" * 60)